@@ -1,11 +1,16 @@
 """Database connection."""
 
 import collections
+import contextlib
+import itertools
 import logging
+import operator
 import os
+import types
 
-from typing import List, Mapping, Optional
-from tinydb import TinyDB, JSONStorage, Query, where
+from typing import List, Mapping, Optional, Tuple
+from tinydb import TinyDB
+from tinydb.queries import QueryInstance
 from tinydb.table import Document
 
 import tinysg.entity
@@ -18,9 +23,41 @@ from tinysg.entity import Fields
 from tinysg.fields import FieldType, UpdateMode
 from tinysg.exceptions import EntityNotFound, FilterSpecError, SchemaError
 from tinysg.middleware import PivotTableMiddleware, ReadCachingMiddleware
+from tinysg.storage import JSONStorage, MemoryStorage
 
 __all__ = ["Connection"]
 
+# Maximum number of resolved filter queries cached per connection.
+QUERY_CACHE_SIZE = 256
+
+# Fields every entity has, but that are not stored in the schema.
+DEFAULT_FIELDS = (
+    {"name": Fields.ID.value, "type": FieldType.NUMBER.value},
+    {"name": Fields.TYPE.value, "type": FieldType.TEXT.value},
+)
+
+_CODE = Fields.CODE.value
+_ID = Fields.ID.value
+_NAME = Fields.NAME.value
+_TYPE = Fields.TYPE.value
+
+# Stands in for a missing field value, which never matches an 'is' filter.
+_MISSING = object()
+
+# Filter operators that map directly onto a tinydb query operator for scalar values.
+SCALAR_TYPES = tinysg.filters.SCALAR_TYPES
+
+# Field types that can only hold scalar values, and so can be indexed by value.
+INDEXED_FIELD_TYPES = {
+    FieldType.BOOL.value,
+    FieldType.DATE.value,
+    FieldType.DATE_TIME.value,
+    FieldType.ENUM.value,
+    FieldType.FLOAT.value,
+    FieldType.NUMBER.value,
+    FieldType.TEXT.value,
+}
+
 
 class Connection(object):
     """TSG connection.
@@ -41,21 +78,90 @@ class Connection(object):
         if not os.path.exists(path):
             raise FileNotFoundError(f"Given path {path} does not exist!")
 
+        self.__setup(JSONStorage, path)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Connection":
+        """Return a connection to an in memory database with the given contents.
+
+        Nothing is written to disk. The contents are used as is, not copied, so they
+        are changed by the connection.
+
+        Args:
+            data (dict): Database contents, as they would be read from a database file.
+
+        Returns:
+            Connection
+        """
+
+        connection = cls.__new__(cls)
+        connection.__setup(MemoryStorage, data)
+
+        return connection
+
+    def __setup(self, storage: type, *args):
+        """Open the database with the given storage and initialize the caches.
+
+        Args:
+            storage (type): Storage class of the database.
+            *args: Arguments to initialize the storage with.
+        """
+
         self.log = logging.getLogger(__name__ + "." + self.__class__.__name__)
 
         self._db = TinyDB(
-            path,
+            *args,
             storage=ReadCachingMiddleware(
-                PivotTableMiddleware(JSONStorage),
+                PivotTableMiddleware(storage),
             ),
         )
 
+        self._entity_schema_cache = {}
+        self._fields_index = None
+        self._schema_cache = {}
+        self._field_cache = {}
+        self._link_field_cache = {}
+        self._required_field_cache = {}
+        self._identifier_field_cache = {}
+        self._id_index = {}
+        self._identifier_index = {}
+        self._reverse_field_index = None
+        self._query_cache = collections.OrderedDict()
+
+        self._transaction_depth = 0
+
+        # Link fields also update their reverse fields, so they have their own handlers.
+        self._link_field_handlers = {
+            FieldType.ENTITY.value: self.__update_entity_link_field,
+            FieldType.MULTI_ENTITY.value: self.__update_multi_entity_link_field,
+        }
+
     @property
     def __tables(self) -> dict:
         """Return a 'pointer' to the raw db tables."""
 
         return self._db.storage.cache
 
+    @contextlib.contextmanager
+    def transaction(self):
+        """Defer writing changes to disk until the outermost transaction exits.
+
+        Each create, delete, revive, and update normally writes the whole database to
+        disk. Inside a transaction the changes are kept in memory and written once.
+
+        There is no rollback; changes made before an error are still written.
+        """
+
+        self._transaction_depth += 1
+
+        try:
+            yield self
+        finally:
+            self._transaction_depth -= 1
+
+            if not self._transaction_depth:
+                self.__flush()
+
     def create(self, entity_type: str, data: dict, return_fields: List[str] = None) -> dict:
         """Create a new entity of the using the given data.
 
@@ -96,11 +202,29 @@ class Connection(object):
         entity_id = table._get_next_id()
         payload["id"] = int(entity_id)
 
-        table.insert(Document(payload, doc_id=entity_id))
+        # The entity is added to the cached table directly, rather than inserted through
+        # tinydb, so it is not written until the flush. Its links are then set like an
+        # update sets them, which also sets them on the linked entities.
+        fields_map = self.__get_fields_map(entity_type)
+
+        entity = dict(payload)
+        links = [
+            (fields_map[field_name], entity.pop(field_name))
+            for field_name, __ in self.__get_link_fields(entity_type)
+            if field_name in entity
+        ]
+
+        self.__set_entity_raw(entity_type, entity_id, entity)
+
+        for field, value in links:
+            handler = self._link_field_handlers[field["type"]]
+            handler(entity, field, value, UpdateMode.SET.value)
+
+        self.__add_identifier(entity_type, payload, int(entity_id))
 
         result = self.__get_entity(entity_type, entity_id, return_fields)
 
-        self._db.storage.flush()
+        self.__flush()
 
         return result
 
@@ -119,43 +243,42 @@ class Connection(object):
             bool: True if the entity was deleted, False if the entity was already deleted.
         """
 
-        self.schema_entity_read(entity_type)
+        self.__get_entity_schema(entity_type)
+
+        # tinydb keys documents by their id as a string.
+        doc_id = str(entity_id)
 
-        active_entity = self.__get_entity_raw(entity_type, entity_id, retired=False) or None
-        retire_entity = self.__get_entity_raw(entity_type, entity_id, retired=True) or None
+        active_entity = self.__get_table_raw(entity_type, retired=False).get(doc_id) or None
+        retire_entity = self.__get_table_raw(entity_type, retired=True).get(doc_id) or None
 
         if active_entity is None and retire_entity is None:
             raise EntityNotFound(f"A(n) '{entity_type}' entity for id {entity_id} does not exist.")
         elif active_entity is not None:
-            entity = self.__get_entity_raw(entity_type, entity_id, retired=False)
-            entity_view = dict(entity)
+            entity = active_entity
 
-            fields = self.schema_field_read_all(entity_type)
+            # Unlinking pops the link fields, so work on a copy of just those fields
+            # and retire the entity itself with its links intact.
+            view_fields = [_TYPE, _ID]
+            view_fields += [name for name, __ in self.__get_link_fields(entity_type)]
 
-            for field in fields:
-                if tinysg.fields.is_entity(field):
-                    self.__update_entity_link_field(
-                        entity_view,
-                        field,
-                        value=None,
-                    )
-                elif tinysg.fields.is_multi_entity(field):
-                    self.__update_multi_entity_link_field(
-                        entity_view,
-                        field,
-                        value=[],
-                        update_mode=UpdateMode.SET.value,
-                    )
+            entity_view = {field: entity[field] for field in view_fields if field in entity}
+
+            for field in self.__get_fields(entity_type):
+                handler = self._link_field_handlers.get(field["type"])
+
+                if handler is not None:
+                    handler(entity_view, field, None, UpdateMode.SET.value)
 
             self.__set_entity_raw(entity_type, entity_id, {}, retired=False)
-            self.__set_entity_raw(entity_type, entity_id, dict(entity), retired=True)
+            self.__set_entity_raw(entity_type, entity_id, entity, retired=True)
 
             result = True
         elif retire_entity is not None:
             result = False
 
         if result:
-            self._db.storage.flush()
+            self.__drop_identifier_index(entity_type, entity)
+            self.__flush()
 
         return result
 
@@ -178,9 +301,32 @@ class Connection(object):
             dict | None
         """
 
-        results = self.find_all(entity_type, filters, return_fields, retired_only)
+        self.__get_entity_schema(entity_type)
 
-        return tinysg.utils.first(results)
+        table_name = self.__get_table_name(entity_type, retired_only)
+        table = self._db.table(table_name)
+
+        entity_id = _id_filter_value(filters)
+
+        # The search stops at the first match, rather than finding them all.
+        if entity_id is not None:
+            result = table.get(doc_id=entity_id)
+        elif filters:
+            query = self.__get_query(entity_type, table_name, filters)
+
+            with tinysg.utils.cache_today():
+                result = table.get(query)
+        else:
+            result = next((doc for doc in table if doc), None)
+
+        # Deleted entities leave an empty document in the active table.
+        if not result:
+            return None
+
+        result = tinysg.entity.get(entity_type, result, return_fields)
+        (result,) = self._join_linked_entities([result], return_fields)
+
+        return result
 
     def find_all(
         self,
@@ -201,19 +347,37 @@ class Connection(object):
             list[dict]
         """
 
-        self.schema_entity_read(entity_type)
+        self.__get_entity_schema(entity_type)
 
         table_name = self.__get_table_name(entity_type, retired_only)
 
-        if filters:
-            filters = self._resolve_filters(entity_type, filters)
-            query = self._filters_to_query(filters)
-            results = self._db.table(table_name).search(query)
+        # Filters on scalar values are answered from the id index without a scan, and
+        # the other filters only test the entities the index matched.
+        entity_ids, other_filters = None, filters
+
+        if filters and not retired_only:
+            entity_ids, other_filters = self.__find_ids_indexed(entity_type, filters)
+
+        if entity_ids is not None:
+            table = self.__get_table_raw(entity_type)
+            results = [Document(table[str(entity_id)], entity_id) for entity_id in entity_ids]
+
+            if other_filters:
+                query = self.__get_query(entity_type, table_name, other_filters)
+
+                with tinysg.utils.cache_today():
+                    results = [result for result in results if query(result)]
+        elif filters:
+            query = self.__get_query(entity_type, table_name, filters)
+
+            # Date filters read today's date once for the search, not once per entity.
+            with tinysg.utils.cache_today():
+                results = self._db.table(table_name).search(query)
         else:
             results = self._db.table(table_name).all()
 
         # TODO: Return empty list for requested multi-entity return fields with no links
-        results = [tinysg.entity.get(entity_type, result, return_fields) for result in results]
+        results = tinysg.entity.get_batch(entity_type, results, return_fields)
         results = self._join_linked_entities(results, return_fields)
 
         return results
@@ -233,10 +397,13 @@ class Connection(object):
             bool: True if the entity was revived, False if the entity was already revived.
         """
 
-        self.schema_entity_read(entity_type)
+        self.__get_entity_schema(entity_type)
+
+        # tinydb keys documents by their id as a string.
+        doc_id = str(entity_id)
 
-        active_entity = self.__get_entity_raw(entity_type, entity_id, retired=False) or None
-        retire_entity = self.__get_entity_raw(entity_type, entity_id, retired=True) or None
+        active_entity = self.__get_table_raw(entity_type, retired=False).get(doc_id) or None
+        retire_entity = self.__get_table_raw(entity_type, retired=True).get(doc_id) or None
 
         if active_entity is None and retire_entity is None:
             raise EntityNotFound(f"A(n) '{entity_type}' entity for id {entity_id} does not exist.")
@@ -245,30 +412,36 @@ class Connection(object):
         elif retire_entity is not None:
             entity = retire_entity
 
-            fields = self.schema_field_read_all(entity_type)
+            fields = self.__get_fields(entity_type)
+
+            # The links are taken off the entity and set again like an update sets them,
+            # which also restores them on the linked entities. Retired links are dropped.
+            links = []
 
-            # Remove retired links
             for field in fields:
                 if tinysg.fields.is_entity(field):
-                    link = retire_entity.get(field["name"])
+                    link = entity.pop(field["name"], None)
 
-                    if link is None:
+                    if link is None or not self.__has_entity(link["type"], link["id"]):
                         continue
-                    elif not self.__has_entity(link["type"], link["id"]):
-                        retire_entity.pop(field["name"], None)
+
+                    links.append((field, link))
                 elif tinysg.fields.is_multi_entity(field):
-                    links = retire_entity.get(field["name"], [])
-                    links = [link for link in links if self.__has_entity(link["type"], link["id"])]
+                    value = entity.pop(field["name"], [])
+                    value = [link for link in value if self.__has_entity(link["type"], link["id"])]
 
-                    if links:
-                        entity[field["name"]] = links
-                    else:
-                        entity.pop(field["name"], None)
+                    if value:
+                        links.append((field, value))
 
             self.__set_entity_raw(entity_type, entity_id, entity, retired=False)
             self.__set_entity_raw(entity_type, entity_id, None, retired=True)
 
-            self._db.storage.flush()
+            for field, value in links:
+                handler = self._link_field_handlers[field["type"]]
+                handler(entity, field, value, UpdateMode.SET.value)
+
+            self._identifier_index.clear()
+            self.__flush()
 
             result = True
 
@@ -303,7 +476,7 @@ class Connection(object):
             dict
         """
 
-        self.schema_entity_read(entity_type)
+        self.__get_entity_schema(entity_type)
 
         table = self._db.table(entity_type)
 
@@ -328,7 +501,8 @@ class Connection(object):
                 f"Cannot unset required fields for '{entity_type}' entity: {', '.join(missing_fields)}'"
             )
 
-        old_payload = dict(entity)
+        # tinydb returns a copy of the document, so it can be merged into directly.
+        old_payload = entity
         old_payload.update(payload)
 
         non_unique_fields = self.__check_entity_identifier(entity_type, old_payload, entity_id)
@@ -340,8 +514,7 @@ class Connection(object):
                 f"because its new identifier field values are not unqiue: {', '.join(non_unique_fields)}"
             )
 
-        fields = self.schema_field_read_all(entity_type)
-        fields_map = {field["name"]: field for field in fields}
+        fields_map = self.__get_fields_map(entity_type)
         multi_entity_update_modes = multi_entity_update_modes or {}
 
         self.__validate_multi_entity_update_modes(
@@ -356,20 +529,10 @@ class Connection(object):
 
         for field_name, value in payload.items():
             field = fields_map[field_name]
+            handler = self._link_field_handlers.get(field["type"])
 
-            if tinysg.fields.is_entity(field):
-                self.__update_entity_link_field(
-                    entity,
-                    field,
-                    value or None,
-                )
-            elif tinysg.fields.is_multi_entity(field):
-                self.__update_multi_entity_link_field(
-                    entity,
-                    field,
-                    value or [],
-                    multi_entity_update_modes.get(field_name),
-                )
+            if handler is not None:
+                handler(entity, field, value, multi_entity_update_modes.get(field_name))
             elif value is None:
                 entity.pop(field_name, None)
             else:
@@ -377,15 +540,74 @@ class Connection(object):
 
         result = self.__get_entity(entity_type, entity_id, return_fields=list(data.keys()))
 
-        self._db.storage.flush()
+        self.__drop_identifier_index(entity_type, payload)
+        self.__flush()
 
         return result
 
+    def update_many(
+        self,
+        entity_type: str,
+        entity_id: int,
+        updates: List[Tuple[dict, Optional[dict]]],
+    ) -> dict:
+        """Apply several updates to the given entity, in order, writing to disk once.
+
+        Args:
+            entity_type (str): Type of entity to update.
+            entity_id (int): ID of the entity to update.
+            updates (list[tuple[dict, dict]]): Pairs of field values to update and
+                multi-entity update modes, as they would be given to update.
+
+        Raises:
+            See update. There is no rollback; updates applied before an error are kept.
+
+        Returns:
+            dict: The entity with every field given in the updates.
+        """
+
+        # With no updates, this still checks the entity exists and returns it.
+        updates = updates or [({}, None)]
+
+        return_fields = {}
+
+        with self.transaction():
+            for data, multi_entity_update_modes in updates:
+                result = self.update(entity_type, entity_id, data, multi_entity_update_modes)
+                return_fields.update(dict.fromkeys(data))
+
+        if len(updates) < 2:
+            return result
+
+        return self.__get_entity(entity_type, entity_id, return_fields=list(return_fields))
+
+    def __flush(self) -> None:
+        """Flush the cached data to disk, unless a transaction is open.
+
+        Entities are edited in the storage cache directly, behind the back of
+        tinydb, so any query results cached by the tables are now stale.
+        """
+
+        if not self._transaction_depth:
+            self._db.storage.flush()
+
+        self.__clear_query_cache()
+
+    def __clear_query_cache(self) -> None:
+        """Clear the query results cached by the tables, the resolved queries, and the id index."""
+
+        self._id_index.clear()
+        self._query_cache.clear()
+
+        for table_name in self._db.tables():
+            self._db.table(table_name).clear_cache()
+
     def __update_entity_link_field(
         self,
         entity: dict,
         field: dict,
         value: Optional[dict],
+        update_mode: str = None,
     ):
         """Update the given entity field and its reverse fields.
 
@@ -393,6 +615,7 @@ class Connection(object):
             entity (dict): Entity to update the field on.
             field (int): Field spec of the field being updated.
             value (dict | None): Update value for the field.
+            update_mode (str): Unused, entity fields have no update modes.
         """
 
         field_name = field["name"]
@@ -407,11 +630,14 @@ class Connection(object):
 
         entity = tinysg.entity.as_handle(entity)
 
+        old_links_map = tinysg.utils.index_by_type([old_value] if old_value else [])
+        new_links_map = tinysg.utils.index_by_type([new_value] if new_value else [])
+
         for reverse_field in self.__reverse_fields(field):
-            field_name = reverse_field["name"]
+            entity_type = reverse_field["entity_type"]
 
-            old_links = [old_value] if old_value else []
-            new_links = [new_value] if new_value else []
+            old_links = old_links_map.get(entity_type, {})
+            new_links = new_links_map.get(entity_type, {})
 
             self.__unlink_entity_from(entity, reverse_field, old_links, new_links)
 
@@ -419,7 +645,7 @@ class Connection(object):
         self,
         entity: dict,
         field: dict,
-        value: list[dict],
+        value: Optional[list[dict]],
         update_mode: str,
     ):
         """Update the given multi-entity field and its reverse fields.
@@ -427,7 +653,7 @@ class Connection(object):
         Args:
             entity (dict): Entity to update the field on.
             field (int): Field spec of the field being updated.
-            value (list[dict]): Update value(s) for the field.
+            value (list[dict] | None): Update value(s) for the field.
             update_mode (str): Update mode for the field.
         """
 
@@ -436,7 +662,7 @@ class Connection(object):
         old_values = entity.get(field_name, [])
         new_values = tinysg.fields.update_multi_entity_field(
             old_values=old_values,
-            new_values=value,
+            new_values=value or [],
             update_mode=update_mode,
         )
 
@@ -447,69 +673,131 @@ class Connection(object):
 
         entity = tinysg.entity.as_handle(entity)
 
-        old_links_map = tinysg.utils.group_by_type(old_values)
-        new_links_map = tinysg.utils.group_by_type(new_values)
+        old_links_map = tinysg.utils.index_by_type(old_values)
+        new_links_map = tinysg.utils.index_by_type(new_values)
 
         for reverse_field in self.__reverse_fields(field):
-            field_name = reverse_field["name"]
             entity_type = reverse_field["entity_type"]
 
-            old_links = old_links_map.get(entity_type, [])
-            new_links = new_links_map.get(entity_type, [])
+            old_links = old_links_map.get(entity_type, {})
+            new_links = new_links_map.get(entity_type, {})
 
             self.__unlink_entity_from(entity, reverse_field, old_links, new_links)
 
     def __reverse_fields(self, field: dict) -> List[dict]:
         """Return the reverse fields for the given field."""
 
-        return self._db.table("_fields").search(
-            (where("table") == field["table"])
-            & (where("link").any([field["entity_type"]]))
-            & (where("name") != field["name"])
-        )
+        if self._reverse_field_index is None:
+            index = collections.defaultdict(list)
+
+            for each in itertools.chain.from_iterable(self.__get_fields_index().values()):
+                if "table" not in each:
+                    continue
+
+                for link_type in each.get("link", []):
+                    index[(each["table"], link_type)].append(each)
+
+            self._reverse_field_index = index
+
+        return [
+            each
+            for each in self._reverse_field_index.get((field["table"], field["entity_type"]), ())
+            if each["name"] != field["name"]
+        ]
 
     def __unlink_entity_from(
-        self, entity: dict, reverse_field: dict, old_links: List[dict], new_links: List[dict]
+        self,
+        entity: dict,
+        reverse_field: dict,
+        old_links: Mapping[int, dict],
+        new_links: Mapping[int, dict],
     ) -> None:
         """Unlink the given entity from the reverse field on the given links.
 
         Args:
             entity (dict): Entity to unlink from the reverse field.
             reverse_field (dict): Spec for the reverse field.
-            old_links (dict): Entities that link the given entity before the update.
-            old_links (dict): Entities that link the given entity after the update.
+            old_links (dict[int, dict]): Entities that link the given entity before the update,
+                by id. All of them are of the reverse field's entity type.
+            new_links (dict[int, dict]): Entities that link the given entity after the update,
+                by id. All of them are of the reverse field's entity type.
         """
 
         field_name = reverse_field["name"]
+        entity_key = tinysg.utils.as_key(entity)
 
-        old_links_ids = {each["id"] for each in old_links}
-        new_links_ids = {each["id"] for each in new_links}
+        table = self.__get_table_raw(reverse_field["entity_type"])
 
-        for link in old_links:
-            if link["id"] in new_links_ids:
+        for link_id in old_links:
+            if link_id in new_links:
                 continue
 
-            link = self.__get_entity_raw(link["type"], link["id"])
+            link = table.get(str(link_id))
 
             if tinysg.fields.is_entity(reverse_field):
                 link.pop(field_name, None)
             elif tinysg.fields.is_multi_entity(reverse_field):
                 old_value = link.get(field_name, [])
-                new_value = [each for each in old_value if each != entity]
+                new_value = [
+                    each for each in old_value if (each["type"], each["id"]) != entity_key
+                ]
 
                 link[field_name] = new_value
 
-        for link in new_links:
-            if link["id"] in old_links_ids:
+        for link_id in new_links:
+            if link_id in old_links:
                 continue
 
-            link = self.__get_entity_raw(link["type"], link["id"])
+            link = table.get(str(link_id))
 
-            if tinysg.fields.is_multi_entity(reverse_field):
-                old_value = link.get(field_name, [])
-                new_value = old_value[:]
+            if tinysg.fields.is_entity(reverse_field):
+                # An entity field links one entity, so the entity it linked before
+                # loses this link.
+                old_owner = link.get(field_name)
+
+                if old_owner and tinysg.utils.as_key(old_owner) != entity_key:
+                    self.__unlink_old_owner(old_owner, reverse_field, link)
+
+                link[field_name] = entity
+            elif tinysg.fields.is_multi_entity(reverse_field):
+                new_value = link.get(field_name, [])[:]
                 new_value.append(entity)
 
+                link[field_name] = new_value
+
+    def __unlink_old_owner(self, owner: dict, reverse_field: dict, link: dict) -> None:
+        """Unlink the given link from the entity its reverse entity field linked before.
+
+        Args:
+            owner (dict): Entity the reverse field of the link linked before.
+            reverse_field (dict): Spec for the reverse entity field, on the link.
+            link (dict): Entity that is being linked to a new entity.
+        """
+
+        owner_entity = self.__get_entity_raw(owner["type"], owner["id"])
+
+        if not owner_entity:
+            return
+
+        link_key = tinysg.utils.as_key(link)
+
+        for field in self.__reverse_fields(reverse_field):
+            if field["entity_type"] != owner["type"]:
+                continue
+
+            field_name = field["name"]
+            value = owner_entity.get(field_name)
+
+            if not value:
+                continue
+            elif tinysg.fields.is_entity(field):
+                if tinysg.utils.as_key(value) == link_key:
+                    owner_entity.pop(field_name, None)
+            elif tinysg.fields.is_multi_entity(field):
+                owner_entity[field_name] = [
+                    each for each in value if tinysg.utils.as_key(each) != link_key
+                ]
+
     def __has_entity(self, entity_type: str, entity_id: int, retired=False) -> bool:
         """Return True if the given entity exists."""
 
@@ -520,9 +808,14 @@ class Connection(object):
     def __get_entity_raw(self, entity_type: str, entity_id: int, retired=False) -> dict:
         """Return a raw handle to the given entity."""
 
+        return self.__get_table_raw(entity_type, retired).get(str(entity_id))
+
+    def __get_table_raw(self, entity_type: str, retired=False) -> dict:
+        """Return a raw handle to the given entity table."""
+
         table_name = self.__get_table_name(entity_type, retired)
 
-        return self.__tables.get(table_name, {}).get(str(entity_id))
+        return self.__tables.get(table_name, {})
 
     def __set_entity_raw(
         self, entity_type: str, entity_id: int, data: dict, retired=False
@@ -559,6 +852,44 @@ class Connection(object):
                     f" - expected {update_modes_str}."
                 )
 
+    def __get_query(self, entity_type: str, table_name: str, filters: List) -> QueryInstance:
+        """Return the cached query for the given filters, resolving it on a miss.
+
+        Deep filters are resolved to the ids of the linked entities, so the cache is
+        cleared whenever the data or the schema changes. Filters that compare with
+        today's date are resolved every time, as the linked entities they match can
+        change from one day to the next.
+
+        Args:
+            entity_type (str): Type of entity to query.
+            table_name (str): Name of the table to query.
+            filters (list): List of filters for the query.
+
+        Returns:
+            tinydb.queries.QueryInstance
+        """
+
+        if tinysg.filters.is_date_relative(filters):
+            return self._filters_to_query(self._resolve_filters(entity_type, filters))
+
+        key = (table_name, tinysg.utils.freeze(filters))
+
+        try:
+            self._query_cache.move_to_end(key)
+
+            return self._query_cache[key]
+        except KeyError:
+            pass
+
+        query = self._filters_to_query(self._resolve_filters(entity_type, filters))
+
+        self._query_cache[key] = query
+
+        if len(self._query_cache) > QUERY_CACHE_SIZE:
+            self._query_cache.popitem(last=False)
+
+        return query
+
     def _resolve_filters(
         self,
         entity_type: str,
@@ -585,7 +916,7 @@ class Connection(object):
             if tinysg.fields.is_deep_field(field):
                 entity_field, link_type, link_field = tinysg.fields.parse_deep_field(field)
 
-                field_schema = self.schema_field_read(entity_type, entity_field)
+                field_schema = self.__get_field(entity_type, entity_field)
 
                 if not tinysg.fields.is_link(field_schema):
                     raise FilterSpecError(
@@ -595,7 +926,7 @@ class Connection(object):
                 link_filters[entity_field].append([link_field, filter_op, *filter_value])
                 link_types[entity_field] = link_type
             else:
-                self.schema_field_read(entity_type, field)
+                self.__get_field(entity_type, field)
 
                 results.append(filter_spec)
 
@@ -605,7 +936,13 @@ class Connection(object):
 
         for link_field, link_filters in link_filters.items():
             link_type = link_types[link_field]
-            links = self.find_all(link_type, link_filters)
+            link_ids, other_filters = self.__find_ids_indexed(link_type, link_filters)
+
+            if link_ids is None or other_filters:
+                links = self.find_all(link_type, link_filters)
+            else:
+                links = [{"type": link_type, "id": link_id} for link_id in link_ids]
+
             links = links or [tinysg.entity.null(link_type)]
             links = [tinysg.entity.as_handle(link) for link in links]
 
@@ -616,42 +953,154 @@ class Connection(object):
 
         return results
 
-    def _filters_to_query(self, filters: List):
-        """Return the tinydb query for the given filters.
+    def __find_ids_indexed(
+        self, entity_type: str, filters: List
+    ) -> Tuple[Optional[List[int]], List]:
+        """Return the ids of the entities matching the filters the id index can answer.
+
+        Only 'is' and 'in' filters on scalar fields can be answered from the index. Their
+        id sets are intersected from the smallest, as the most selective filter bounds
+        the result.
 
         Args:
+            entity_type (str): Type of entity to query.
             filters (list): List of filters for the query.
 
+        Raises:
+            SchemaError: If the given entity type does not exist.
+            SchemaError: If a filter field does not exist.
+
         Returns:
-            Query
+            tuple[list[int] | None, list]: The matching ids, and the filters that could not
+                be answered from the index. The ids are None if no filter could be.
         """
 
-        result = None
+        self.__get_entity_schema(entity_type)
+
+        id_sets = []
+        other_filters = []
 
         for filter_spec in filters:
-            query = self._filter_to_query(filter_spec)
+            entity_ids = self.__find_ids_for_filter(entity_type, filter_spec)
 
-            if result is None:
-                result = query
+            if entity_ids is None:
+                other_filters.append(filter_spec)
             else:
-                result = result & query
+                id_sets.append(entity_ids)
 
-        return result
+        if not id_sets:
+            return None, other_filters
 
-    def _filter_to_query(self, filter_spec: List[str]) -> Query:
-        """Return the tinydb query for the given filter spec.
+        id_sets.sort(key=len)
+
+        result = set(id_sets[0])
+
+        for entity_ids in id_sets[1:]:
+            if not result:
+                break
+
+            result &= entity_ids
+
+        return sorted(result), other_filters
+
+    def __find_ids_for_filter(self, entity_type: str, filter_spec: List) -> Optional[set]:
+        """Return the ids of the entities matching the given filter, using the id index.
 
         Args:
-            filters_spec (list[str]): Filter spec to create the tinydb query for.
+            entity_type (str): Type of entity to query.
+            filter_spec (list): Filter for the query.
 
         Returns:
-            Query
+            set[int] | None: None if the filter cannot be answered from the index.
         """
 
+        fops = tinysg.filters.FilterOperator
+
         field, filter_op, filter_value = tinysg.filters.parse_filter_spec(filter_spec)
-        func = tinysg.filters.get(filter_op)
 
-        return Query()[field].test(lambda field_value: func(field_value, *filter_value))
+        if tinysg.fields.is_deep_field(field):
+            return None
+
+        field_schema = self.__get_field(entity_type, field)
+
+        if field_schema["type"] not in INDEXED_FIELD_TYPES:
+            return None
+
+        if len(filter_value) != 1:
+            return None
+
+        (value,) = filter_value
+
+        if filter_op == fops.IS.value and isinstance(value, SCALAR_TYPES):
+            values = [value]
+        elif filter_op == fops.IN.value and isinstance(value, (list, tuple)):
+            values = value
+        else:
+            return None
+
+        if not all(isinstance(each, SCALAR_TYPES) for each in values):
+            return None
+
+        index = self.__get_id_index(entity_type, field)
+
+        if len(values) == 1:
+            return index.get(values[0], set())
+
+        entity_ids = set()
+
+        for each in values:
+            entity_ids.update(index.get(each, ()))
+
+        return entity_ids
+
+    def __get_id_index(self, entity_type: str, field_name: str) -> Mapping:
+        """Return the index of entity ids by value for the given field.
+
+        The index is built on first use and cleared whenever the data is flushed.
+
+        Returns:
+            dict[Any, set[int]]
+        """
+
+        key = (entity_type, field_name)
+
+        try:
+            return self._id_index[key]
+        except KeyError:
+            pass
+
+        index = collections.defaultdict(set)
+
+        for entity in self.__tables.get(entity_type, {}).values():
+            value = entity.get(field_name)
+
+            if isinstance(value, SCALAR_TYPES):
+                index[value].add(entity["id"])
+
+        self._id_index[key] = index
+
+        return index
+
+    def _filters_to_query(self, filters: List) -> QueryInstance:
+        """Return the tinydb query for the given filters.
+
+        The filters are compiled into a single query, rather than one query per filter.
+        Queries that compare with today's date have no hash, so the tables do not cache
+        their results from one day to the next.
+
+        Args:
+            filters (list): List of filters for the query.
+
+        Returns:
+            QueryInstance
+        """
+
+        test = tinysg.filters.compile(filters)
+
+        if tinysg.filters.is_date_relative(filters):
+            return QueryInstance(test, None)
+
+        return QueryInstance(test, ("filters", tinysg.utils.freeze(filters)))
 
     def _join_linked_entities(
         self,
@@ -660,6 +1109,9 @@ class Connection(object):
     ) -> List[dict]:
         """Return the entity form of the given tinydb record.
 
+        The links are joined breadth-first, one level of deep fields at a time, so the
+        linked entities of each level are fetched with one query per type.
+
         Args:
             results (list[dict]): List of entities to join the linked fields on.
             return_fields (list[str]): List of entity fields to return.
@@ -668,11 +1120,46 @@ class Connection(object):
             list[dict]
         """
 
-        link_ids = self.__get_links_map(results)
-        link_fields = self.__get_link_fields_map(return_fields)
+        batches = [(results, return_fields)]
+
+        while batches:
+            requests = {}
+            pending = []
+
+            for entity_list, entity_fields in batches:
+                link_ids = self.__get_links_map(entity_list)
+
+                if not link_ids:
+                    continue
+
+                link_fields = self.__get_link_fields_map(entity_fields)
+                link_keys = {}
+
+                for link_type, entity_ids in link_ids.items():
+                    key = (
+                        link_type,
+                        (_CODE, _NAME, *link_fields.get(link_type, [])),
+                    )
+                    requests.setdefault(key, set()).update(entity_ids)
+                    link_keys[link_type] = key
 
-        links = self.__get_linked_field_values(link_ids, link_fields)
-        self.__set_linked_field_values(results, links)
+                pending.append((entity_list, link_keys))
+
+            linked = {}
+
+            for key, entity_ids in requests.items():
+                link_type, link_fields = key
+                linked[key] = self.__get_linked_entities(link_type, list(link_fields), entity_ids)
+
+            for entity_list, link_keys in pending:
+                links = {link_type: linked[key] for link_type, key in link_keys.items()}
+
+                self.__set_linked_field_values(entity_list, links)
+
+            batches = [
+                (list(entity_map.values()), list(link_fields))
+                for (__, link_fields), entity_map in linked.items()
+            ]
 
         return results
 
@@ -692,22 +1179,118 @@ class Connection(object):
 
         result = []
 
-        identifier = {
-            field["name"]: data.get(field["name"])
-            for field in self.schema_field_read_all(entity_type)
-            if field.get("identifier", False)
-        }
+        field_names = self.__get_identifier_fields(entity_type)
+
+        # Most entity types have no identifier fields, so there is nothing to check.
+        if not field_names:
+            return result
+
+        identifier = {field_name: data.get(field_name) for field_name in field_names}
+
+        index = self.__get_identifier_index(entity_type)
 
-        if identifier:
+        if index is None:
             filters = [[field, "is", value] for field, value in identifier.items()]
             entity = self.find_one(entity_type, filters)
+            other_id = None if entity is None else entity["id"]
+        else:
+            other_id = index.get(_identifier_key(identifier.values()))
 
-            if (entity is not None) and (entity["id"] != entity_id):
-                result = list(identifier.keys())
-                result.sort()
+        if (other_id is not None) and (other_id != entity_id):
+            result = list(identifier.keys())
+            result.sort()
 
         return result
 
+    def __get_identifier_index(self, entity_type: str) -> Optional[Mapping[tuple, int]]:
+        """Return a map of the identifier field values to the id of the entity that has them.
+
+        The index is built lazily from the raw table. Entities without identifier fields,
+        or with a multi-entity identifier field, cannot be indexed.
+
+        Args:
+            entity_type (str): Type of entity to get the index for.
+
+        Returns:
+            dict[tuple, int]: None if the entity type cannot be indexed.
+        """
+
+        try:
+            return self._identifier_index[entity_type]
+        except KeyError:
+            pass
+
+        field_names = self.__get_identifier_fields(entity_type)
+        fields_map = self.__get_fields_map(entity_type)
+
+        if not field_names or any(
+            tinysg.fields.is_multi_entity(fields_map[field_name]) for field_name in field_names
+        ):
+            self._identifier_index[entity_type] = None
+
+            return None
+
+        index = {}
+
+        for entity_id, entity in self.__get_table_raw(entity_type).items():
+            if entity:
+                values = (entity.get(field_name, _MISSING) for field_name in field_names)
+                index.setdefault(_identifier_key(values), int(entity_id))
+
+        self._identifier_index[entity_type] = index
+
+        return index
+
+    def __add_identifier(self, entity_type: str, payload: dict, entity_id: int) -> None:
+        """Add the identifier of a new entity to the identifier index.
+
+        A new entity with bi-directional links also edits the entities it links to, so
+        the whole index is dropped instead. Otherwise, the indexes of other entity types
+        are kept.
+
+        Args:
+            entity_type (str): Type of the new entity.
+            payload (dict): Field values of the new entity.
+            entity_id (int): ID of the new entity.
+        """
+
+        fields_map = self.__get_fields_map(entity_type)
+
+        field_names = [name for name, value in payload.items() if value]
+
+        if any("link_field" in fields_map.get(name, {}) for name in field_names):
+            self._identifier_index.clear()
+            return
+
+        index = self._identifier_index.get(entity_type)
+
+        if index is None:
+            return
+
+        values = (
+            payload.get(field_name, _MISSING)
+            for field_name in self.__get_identifier_fields(entity_type)
+        )
+        index.setdefault(_identifier_key(values), entity_id)
+
+    def __drop_identifier_index(self, entity_type: str, field_names: List[str]) -> None:
+        """Drop the identifier indexes made stale by editing the given fields of an entity.
+
+        Editing a bi-directional link field also edits the entities it links to, so every
+        index is dropped. Otherwise, only the index of the given entity type is.
+
+        Args:
+            entity_type (str): Type of the edited entity.
+            field_names (list[str]): Names of the edited fields.
+        """
+
+        fields_map = self.__get_fields_map(entity_type)
+
+        if any("link_field" in fields_map.get(name, {}) for name in field_names):
+            self._identifier_index.clear()
+        else:
+            self._identifier_index.pop(entity_type, None)
+
     def __check_entity_payload(self, entity_type: str, data: dict) -> List[str]:
         """Return the missing required field(s) in the given entity payload.
 
@@ -719,15 +1302,11 @@ class Connection(object):
             list[str]
         """
 
-        fields = self.schema_field_read_all(entity_type)
-
-        required_fields = [field for field in fields if field.get("required", False)]
-        missing_fields = [
-            field["name"] for field in required_fields if data.get(field["name"]) is None
+        return [
+            field_name
+            for field_name in self.__get_required_fields(entity_type)
+            if data.get(field_name) is None
         ]
-        missing_fields.sort()
-
-        return missing_fields
 
     def __get_links_map(self, entity_list: List[dict]) -> Mapping:
         """Return a map of the linked entities in the given results.
@@ -739,22 +1318,17 @@ class Connection(object):
             dict[str, set[int]]
         """
 
-        result = collections.defaultdict(set)
-
-        def _add(link):
-            result[link[Fields.TYPE.value]].add(link[Fields.ID.value])
+        result = {}
 
         for entity in entity_list:
-            entity_type = entity[Fields.TYPE.value]
+            for field, is_multi in self.__get_link_fields(entity[_TYPE]):
+                value = entity.get(field)
 
-            for field, value in entity.items():
-                field_schema = self.schema_field_read(entity_type, field)
+                if not value:
+                    continue
 
-                if tinysg.fields.is_entity(field_schema):
-                    _add(value)
-                elif tinysg.fields.is_multi_entity(field_schema):
-                    for val in value:
-                        _add(val)
+                for link in value if is_multi else (value,):
+                    result.setdefault(link[_TYPE], set()).add(link[_ID])
 
         return result
 
@@ -778,35 +1352,45 @@ class Connection(object):
 
         return result
 
-    def __get_linked_field_values(self, link_ids, link_fields) -> Mapping[str, dict]:
-        """Get the linked field values.
+    def __get_linked_entities(
+        self, entity_type: str, entity_fields: List[str], entity_ids: set
+    ) -> Mapping[int, dict]:
+        """Get the linked entities of the given type, without joining their own links.
 
         Args:
-            link_ids [dict[str, set[int]]]: Map of linked entity ids.
-            link_fields [dict[str, list[str]]]: Map of linked deep fields.
+            entity_type (str): Type of the linked entities.
+            entity_fields (list[str]): List of fields to return for the linked entities.
+            entity_ids (set[int]): IDs of the linked entities.
 
         Returns:
-            dict[str, dict[int, dict]]
+            dict[int, dict]
         """
 
+        # Read straight from the storage cache, as tinydb would copy each whole document.
+        table = self.__get_table_raw(entity_type)
+
+        default_fields = (_TYPE, _ID)
+        entity_fields = [
+            field for field in dict.fromkeys(entity_fields) if field not in default_fields
+        ]
+
         result = {}
 
-        for entity_type, entity_ids in link_ids.items():
-            entity_fields = [Fields.CODE.value, Fields.NAME.value] + link_fields.get(
-                entity_type, []
-            )
-            entity_list = self._db.table(entity_type).get(doc_ids=entity_ids)
-            entity_list = [
-                tinysg.entity.get(entity_type, each, entity_fields) for each in entity_list
-            ]
+        for entity_id in entity_ids:
+            raw_entity = table.get(str(entity_id))
 
-            self._join_linked_entities(entity_list, entity_fields)
+            if raw_entity is None:
+                continue
+
+            entity = {_TYPE: entity_type, _ID: entity_id}
+            entity.update(
+                (field, raw_entity[field]) for field in entity_fields if field in raw_entity
+            )
 
-            for entity in entity_list:
-                if Fields.CODE.value in entity:
-                    entity[Fields.NAME.value] = entity.pop(Fields.CODE.value)
+            if _CODE in entity:
+                entity[_NAME] = entity.pop(_CODE)
 
-            result[entity_type] = tinysg.entity.as_entity_map(entity_list)
+            result[entity_id] = entity
 
         return result
 
@@ -836,8 +1420,7 @@ class Connection(object):
             dict
         """
 
-        fields = self.schema_field_read_all(entity_type)
-        fields_map = {field["name"]: field for field in fields}
+        fields_map = self.__get_fields_map(entity_type)
 
         if payload is None:
             payload = {
@@ -874,9 +1457,11 @@ class Connection(object):
             (link_type,) = {link["type"] for link in links}
             link_ids = {link["id"] for link in links}
 
-            links = self._db.table(link_type).get(doc_ids=list(link_ids))
+            # Check the ids against the raw table keys, rather than have tinydb copy
+            # every document in the table to find them.
+            link_table = self.__get_table_raw(link_type)
 
-            missing_link_ids = link_ids - {link.doc_id for link in links}
+            missing_link_ids = {link_id for link_id in link_ids if str(link_id) not in link_table}
 
             if missing_link_ids:
                 missing_link_ids_str = ", ".join(sorted(map(str, missing_link_ids)))
@@ -890,7 +1475,7 @@ class Connection(object):
     def __set_defaults(self, entity_type: str, payload: dict) -> dict:
         """Set the default values for the new entity."""
 
-        fields = self.schema_field_read_all(entity_type)
+        fields = self.__get_fields(entity_type)
 
         for field in fields:
             field_name = field["name"]
@@ -921,19 +1506,16 @@ class Connection(object):
             links [dict]: Map of linked entities.
         """
 
-        def _get(link):
-            return links[link[Fields.TYPE.value]][link[Fields.ID.value]]
-
         for result in results:
-            entity_type = result[Fields.TYPE.value]
-
-            for field, value in result.items():
-                field_schema = self.schema_field_read(entity_type, field)
+            for field, is_multi in self.__get_link_fields(result[_TYPE]):
+                value = result.get(field)
 
-                if tinysg.fields.is_entity(field_schema):
-                    result[field] = _get(value)
-                elif tinysg.fields.is_multi_entity(field_schema):
-                    result[field] = [_get(v) for v in value]
+                if not value:
+                    continue
+                elif is_multi:
+                    result[field] = [links[each["type"]][each["id"]] for each in value]
+                else:
+                    result[field] = links[value["type"]][value["id"]]
 
         return results
 
@@ -947,9 +1529,12 @@ class Connection(object):
             bool
         """
 
-        result = self._db.table("_schema").get(where("entity_type") == entity_type)
-
-        return result is not None
+        try:
+            self.__get_entity_schema(entity_type)
+        except SchemaError:
+            return False
+        else:
+            return True
 
     def schema_entity_create(self, entity_type: str) -> dict:
         """Add the given entity type to the schema.
@@ -973,6 +1558,8 @@ class Connection(object):
                 }
             )
 
+            self.__clear_schema_cache()
+
             return self.schema_entity_read(entity_type)
         else:
             raise SchemaError(f"A(n) '{entity_type}' entity has already been registered.")
@@ -987,7 +1574,7 @@ class Connection(object):
             tinysg.exceptions.SchemaError: If the given entity schema does not exist.
         """
 
-        self.schema_entity_read(entity_type)
+        self.__get_entity_schema(entity_type)
 
         # tinydb .remove and .update operations write to disk, so we  manipulate the data directly.
         # we might be able to get around this with a 'transaction' context in the middleware,
@@ -996,6 +1583,9 @@ class Connection(object):
         self.__delete_entity_fields(entity_type)
         self._db.drop_table(entity_type)
 
+        self.__clear_schema_cache()
+        self.__clear_query_cache()
+
     def __delete_entity_links(self, entity_type: str):
         """Delete links to the given entity type.
 
@@ -1006,11 +1596,16 @@ class Connection(object):
         old = self.__tables["_schema"]
         new = {}
 
+        fields_index = self.__get_fields_index()
+
         for key, schema in old.items():
             if schema["entity_type"] == entity_type:
                 continue
 
-            fields = [field for field in schema["fields"] if tinysg.fields.is_link(field)]
+            new[key] = schema
+
+            fields = fields_index.get(schema["entity_type"], [])
+            fields = [field for field in fields if tinysg.fields.is_link(field)]
             fields = [field for field in fields if entity_type in field["link"]]
 
             if not fields:
@@ -1028,8 +1623,6 @@ class Connection(object):
                     if tinysg.fields.is_multi_entity(field):
                         entity.pop(field["name"], None)
 
-            new[key] = schema
-
         self.__tables["_schema"] = tinysg.utils.reindex(new)
 
     def __delete_entity_fields(self, entity_type):
@@ -1064,12 +1657,23 @@ class Connection(object):
             dict
         """
 
-        result = self._db.table("_schema").get(where("entity_type") == entity_type)
+        return dict(self.__get_entity_schema(entity_type))
+
+    def __get_entity_schema(self, entity_type: str) -> dict:
+        """Return the cached schema for the given entity type.
+
+        Raises:
+            tinysg.exceptions.SchemaError: If the given entity schema does not exist.
+        """
+
+        if not self._entity_schema_cache:
+            for result in self._db.table("_schema").all():
+                self._entity_schema_cache[result["entity_type"]] = result
 
-        if result is None:
+        try:
+            return self._entity_schema_cache[entity_type]
+        except KeyError:
             raise SchemaError(f"A(n) '{entity_type}' entity has not been registered.")
-        else:
-            return dict(result)
 
     def schema_entity_read_all(self) -> dict:
         """Return the schema for all registered entity types.
@@ -1095,11 +1699,9 @@ class Connection(object):
             bool
         """
 
-        result = self._db.table("_fields").get(
-            (where("entity_type") == entity_type) & (where("name") == field_name)
-        )
+        fields = self.__get_fields_index().get(entity_type, [])
 
-        return result is not None
+        return any(field["name"] == field_name for field in fields)
 
     def schema_field_create(self, entity_type: str, field_name: str, properties: dict) -> dict:
         """Add a field to the given entity type in the schema.
@@ -1116,28 +1718,26 @@ class Connection(object):
             bool
         """
 
-        try:
-            self.schema_field_read(entity_type, field_name)
-        except SchemaError:
-            self.schema_entity_read(entity_type)
+        if field_name in self.__get_fields_map(entity_type):
+            raise SchemaError(f"A(n) '{entity_type}.{field_name}' field already exists.")
 
-            tinysg.fields.validate_spec(properties)
-            tinysg.fields.conform_spec(properties)
+        tinysg.fields.validate_spec(properties)
+        tinysg.fields.conform_spec(properties)
 
-            # TODO: Verify link entity exists
-            # TODO: Create/update link entity table
+        # TODO: Verify link entity exists
+        # TODO: Create/update link entity table
 
-            self._db.table("_fields").insert(
-                {
-                    "entity_type": entity_type,
-                    "name": field_name,
-                    **properties,
-                }
-            )
+        field = {
+            "entity_type": entity_type,
+            "name": field_name,
+            **properties,
+        }
 
-            return self.schema_field_read(entity_type, field_name)
-        else:
-            raise SchemaError(f"A(n) '{entity_type}.{field_name}' field already exists.")
+        field_id = self._db.table("_fields").insert(field)
+
+        self.__clear_schema_cache()
+
+        return dict(field, id=field_id)
 
     def schema_field_delete(self, entity_type: str, field_name: str) -> None:
         """Delete the given field the schema.
@@ -1151,11 +1751,13 @@ class Connection(object):
             tinysg.exceptions.SchemaError: If the given field does not exists.
         """
 
-        field = self.schema_field_read(entity_type, field_name)
+        field = self.__get_field(entity_type, field_name)
 
         self._db.table("_fields").remove(doc_ids=[field["id"]])
         self._db.table(entity_type).update(tinysg.operations.safe_delete(field_name))
 
+        self.__clear_schema_cache()
+
     def schema_field_read(self, entity_type: str, field_name: str) -> dict:
         """Return the schema for the given entity field.
 
@@ -1171,22 +1773,7 @@ class Connection(object):
             dict
         """
 
-        self.schema_entity_read(entity_type)
-
-        if field_name == "id":
-            return {"name": field_name, "type": "number"}
-
-        if field_name == "type":
-            return {"name": field_name, "type": "text"}
-
-        result = self._db.table("_fields").get(
-            (where("entity_type") == entity_type) & (where("name") == field_name)
-        )
-
-        if result is None:
-            raise SchemaError(f"Entity '{entity_type}' has no '{field_name}' field.")
-        else:
-            return dict(result, id=result.doc_id)
+        return dict(self.__get_field(entity_type, field_name))
 
     def schema_field_read_all(self, entity_type: str) -> List[dict]:
         """Return the schema for the given entity's fields.
@@ -1201,19 +1788,192 @@ class Connection(object):
             list[dict]
         """
 
-        self.schema_entity_read(entity_type)
+        return [dict(field) for field in self.__get_fields(entity_type)]
+
+    def schema_field_read_many(self, entity_type: str, field_names: List[str]) -> dict:
+        """Return the schema for the given entity fields, by name.
 
-        results = self._db.table("_fields").search(where("entity_type") == entity_type)
-        results = [dict(result, id=result.doc_id) for result in results]
+        Args:
+            entity_type (str): Entity type the fields are on.
+            field_names (list[str]): Names of the fields to return the schema for.
+
+        Raises:
+            tinysg.exceptions.SchemaError: If the given entity schema does not exist.
+            tinysg.exceptions.SchemaError: If any of the given fields do not exist.
+
+        Returns:
+            dict[str, dict]
+        """
+
+        fields = self.__get_fields_map(entity_type)
+        results = {}
+
+        for field_name in field_names:
+            try:
+                results[field_name] = dict(fields[field_name])
+            except KeyError:
+                raise SchemaError(f"Entity '{entity_type}' has no '{field_name}' field.")
+
+        return results
+
+    def __get_field(self, entity_type: str, field_name: str) -> dict:
+        """Return the cached schema for the given entity field.
+
+        Raises:
+            tinysg.exceptions.SchemaError: If the given entity schema does not exist.
+            tinysg.exceptions.SchemaError: If the given field does not exists.
+        """
+
+        try:
+            return self.__get_fields_map(entity_type)[field_name]
+        except KeyError:
+            raise SchemaError(f"Entity '{entity_type}' has no '{field_name}' field.")
+
+    def __get_fields(self, entity_type: str) -> List[dict]:
+        """Return the cached schema for the given entity's fields.
+
+        The cache is cleared whenever the schema is edited, so the result
+        must be treated as read-only.
+
+        Raises:
+            tinysg.exceptions.SchemaError: If the given entity schema does not exist.
+        """
+
+        try:
+            return self._schema_cache[entity_type]
+        except KeyError:
+            pass
+
+        self.__get_entity_schema(entity_type)
+
+        results = list(self.__get_fields_index().get(entity_type, []))
 
         # TODO: Add id/type fields in middleware
-        results += [
-            {"entity_type": entity_type, "name": "id", "type": "number"},
-            {"entity_type": entity_type, "name": "type", "type": "text"},
-        ]
+        results += [dict(field, entity_type=entity_type) for field in DEFAULT_FIELDS]
+
+        self._schema_cache[entity_type] = results
+        self._field_cache[entity_type] = types.MappingProxyType(
+            {field["name"]: field for field in results}
+        )
 
         return results
 
+    def __get_fields_index(self) -> Mapping[str, List[dict]]:
+        """Return the fields of every entity type, by entity type.
+
+        The index is built from a single scan of the fields table, and cleared whenever
+        the schema is edited.
+        """
+
+        if self._fields_index is None:
+            self._fields_index = collections.defaultdict(list)
+
+            for result in self._db.table("_fields").all():
+                self._fields_index[result["entity_type"]].append(dict(result, id=result.doc_id))
+
+        return self._fields_index
+
+    def __get_fields_map(self, entity_type: str) -> Mapping[str, dict]:
+        """Return the cached schema for the given entity's fields, by name.
+
+        The map is read-only, as it is shared by every caller until the schema is edited.
+
+        Raises:
+            tinysg.exceptions.SchemaError: If the given entity schema does not exist.
+        """
+
+        try:
+            return self._field_cache[entity_type]
+        except KeyError:
+            self.__get_fields(entity_type)
+
+            return self._field_cache[entity_type]
+
+    def __get_link_fields(self, entity_type: str) -> List[Tuple[str, bool]]:
+        """Return the cached (name, is_multi) pairs for the given entity's link fields.
+
+        Raises:
+            tinysg.exceptions.SchemaError: If the given entity schema does not exist.
+        """
+
+        try:
+            return self._link_field_cache[entity_type]
+        except KeyError:
+            pass
+
+        result = []
+
+        for field in self.__get_fields(entity_type):
+            if tinysg.fields.is_entity(field):
+                result.append((field["name"], False))
+            elif tinysg.fields.is_multi_entity(field):
+                result.append((field["name"], True))
+
+        self._link_field_cache[entity_type] = result
+
+        return result
+
+    def __get_required_fields(self, entity_type: str) -> Tuple[str, ...]:
+        """Return the cached, sorted names of the given entity's required fields.
+
+        Raises:
+            tinysg.exceptions.SchemaError: If the given entity schema does not exist.
+        """
+
+        try:
+            return self._required_field_cache[entity_type]
+        except KeyError:
+            pass
+
+        result = tuple(
+            sorted(
+                field["name"]
+                for field in self.__get_fields(entity_type)
+                if field.get("required", False)
+            )
+        )
+
+        self._required_field_cache[entity_type] = result
+
+        return result
+
+    def __get_identifier_fields(self, entity_type: str) -> Tuple[str, ...]:
+        """Return the cached names of the given entity's identifier fields, in field order.
+
+        Raises:
+            tinysg.exceptions.SchemaError: If the given entity schema does not exist.
+        """
+
+        try:
+            return self._identifier_field_cache[entity_type]
+        except KeyError:
+            pass
+
+        result = tuple(
+            field["name"]
+            for field in self.__get_fields(entity_type)
+            if field.get("identifier", False)
+        )
+
+        self._identifier_field_cache[entity_type] = result
+
+        return result
+
+    def __clear_schema_cache(self) -> None:
+        """Clear the cached field schemas."""
+
+        self._entity_schema_cache.clear()
+        self._fields_index = None
+        self._schema_cache.clear()
+        self._field_cache.clear()
+        self._link_field_cache.clear()
+        self._required_field_cache.clear()
+        self._identifier_field_cache.clear()
+        self._id_index.clear()
+        self._identifier_index.clear()
+        self._reverse_field_index = None
+        self._query_cache.clear()
+
     def schema_field_update(self, entity_type: str, field_name: str, properties: dict) -> dict:
         """Update the given field in the schema.
 
@@ -1230,7 +1990,7 @@ class Connection(object):
             dict
         """
 
-        field = self.schema_field_read(entity_type, field_name)
+        field = self.__get_field(entity_type, field_name)
 
         old = dict(field)
         old.pop("id")
@@ -1238,6 +1998,9 @@ class Connection(object):
         new = dict(old)
         new.update(properties)
 
+        if new == old:
+            return dict(field)
+
         tinysg.fields.validate_spec(new)
 
         self._db.table("_fields").update(
@@ -1245,4 +2008,47 @@ class Connection(object):
             doc_ids=[field["id"]],
         )
 
-        return self.schema_field_read(entity_type, field_name)
+        self.__clear_schema_cache()
+
+        return dict(new, id=field["id"])
+
+
+def _identifier_key(values) -> tuple:
+    """Return the identifier index key for the given identifier field values.
+
+    Links are keyed by their handle, as entities are compared by type and id.
+    """
+
+    return tuple(
+        tinysg.utils.freeze(tinysg.entity.as_handle(value))
+        if isinstance(value, dict) and _ID in value and _TYPE in value
+        else tinysg.utils.freeze(value)
+        for value in values
+    )
+
+
+def _id_filter_value(filters: List) -> Optional[int]:
+    """Return the id the given filters are for, if they are a single 'id is' filter.
+
+    Args:
+        filters (list): List of filters for the query.
+
+    Returns:
+        int | None
+    """
+
+    if len(filters) != 1:
+        return None
+
+    filter_spec = filters[0]
+
+    if not isinstance(filter_spec, (list, tuple)) or len(filter_spec) != 3:
+        return None
+
+    field, filter_op, value = filter_spec
+
+    if field != _ID or filter_op != tinysg.filters.FilterOperator.IS.value:
+        return None
+
+    # A bool equals 0 or 1, but is not a document id, so it is left to the query.
+    return value if type(value) is int else None
@@ -1,9 +1,10 @@
 """Entity functions."""
 
-import itertools
 import enum
+import functools
+import operator
 
-from typing import Mapping, List
+from typing import Mapping, List, Tuple
 
 
 class Fields(enum.Enum):
@@ -16,10 +17,18 @@ class Fields(enum.Enum):
     PROJECT = "project"
 
 
+_ID = Fields.ID.value
+_TYPE = Fields.TYPE.value
+
+_DEFAULT_FIELDS = (_TYPE, _ID)
+
+_get_id = operator.itemgetter(_ID)
+
+
 def as_entity_map(entity_list: List[dict]) -> Mapping[int, dict]:
     """Return the given entity list as an entity map."""
 
-    return {entity[Fields.ID.value]: entity for entity in entity_list}
+    return dict(zip(map(_get_id, entity_list), entity_list))
 
 
 def as_handle(entity: dict) -> dict:
@@ -31,40 +40,66 @@ def as_handle(entity: dict) -> dict:
 def eq(a: dict, b: dict) -> bool:
     """Return True if the two entities are the same."""
 
-    return a["type"] == b["type"] and a["id"] == b["id"]
+    return (a[_TYPE], a[_ID]) == (b[_TYPE], b[_ID])
 
 
 def get(entity_type: str, result: dict, return_fields: List[str] = None) -> dict:
     """Return the entity for the given tinydb Document."""
 
-    entity = {
-        Fields.ID.value: result.doc_id,
-        Fields.TYPE.value: entity_type,
-        **result,
-    }
+    (entity,) = get_batch(entity_type, [result], return_fields)
+
+    return entity
+
+
+def get_batch(
+    entity_type: str, results: List[dict], return_fields: List[str] = None
+) -> List[dict]:
+    """Return the entities for the given tinydb Documents.
+
+    The return fields are resolved once for the whole batch.
+    """
+
+    if return_fields is None:
+        return [{_ID: result.doc_id, _TYPE: entity_type, **result} for result in results]
+
+    fields = _get_return_fields(tuple(return_fields))
+
+    return [
+        {
+            _TYPE: entity_type,
+            _ID: result.doc_id,
+            **{field: result[field] for field in fields if field in result},
+        }
+        for result in results
+    ]
+
+
+@functools.lru_cache(maxsize=256)
+def _get_return_fields(return_fields: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Return the given return fields without duplicates or the default fields.
 
-    return _get(entity, return_fields)
+    Queries tend to repeat the same return fields, so the result is cached.
+    """
+
+    return tuple(field for field in dict.fromkeys(return_fields) if field not in _DEFAULT_FIELDS)
 
 
 def null(entity_type: str) -> dict:
     """Return a null entity of the given type."""
 
-    return {Fields.TYPE.value: entity_type, Fields.ID.value: -1}
+    return {_TYPE: entity_type, _ID: -1}
 
 
 def _get(entity: dict, return_fields: List[str] = None):
     """Return the payload for the given return fields."""
 
-    default_fields = [
-        Fields.TYPE.value,
-        Fields.ID.value,
-    ]
-
     if return_fields is None:
         return entity
 
-    return {
-        field: entity[field]
-        for field in itertools.chain(default_fields, return_fields)
-        if field in entity
-    }
+    payload = {field: entity[field] for field in _DEFAULT_FIELDS if field in entity}
+
+    for field in return_fields:
+        if field in entity:
+            payload[field] = entity[field]
+
+    return payload
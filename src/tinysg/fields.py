@@ -3,7 +3,7 @@
 import datetime
 import collections
 import enum
-import json
+import functools
 
 import tinysg.utils
 
@@ -33,6 +33,15 @@ class FieldType(enum.Enum):
     TEXT_LIST = "textList"
 
 
+_JSON_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+_ENTITY = FieldType.ENTITY.value
+_MULTI_ENTITY = FieldType.MULTI_ENTITY.value
+
+_FIELD_TYPES = frozenset(each.value for each in FieldType)
+_FIELD_TYPES_STR = ", ".join([each.value for each in FieldType])
+
+
 class UpdateMode(enum.Enum):
     """Multi-entity link field update modes."""
 
@@ -52,76 +61,99 @@ class UpdateMode(enum.Enum):
 
 
 FIELD_OPERATORS = {
-    FieldType.BOOL.value: [
-        fop.IS.value,
-    ],
-    FieldType.DATE.value: [
-        fop.BETWEEN.value,
-        fop.GREATER_THAN.value,
-        fop.LESS_THAN.value,
-        fop.IN_CALENDAR.value,
-        fop.IN.value,
-        fop.IS.value,
-        fop.IN_LAST.value,
-        fop.IN_NEXT.value,
-    ],
-    FieldType.DATE_TIME.value: [
-        fop.BETWEEN.value,
-        fop.GREATER_THAN.value,
-        fop.LESS_THAN.value,
-        fop.IN_CALENDAR.value,
-        fop.IN.value,
-        fop.IS.value,
-        fop.IN_LAST.value,
-        fop.IN_NEXT.value,
-    ],
-    FieldType.ENTITY.value: [
-        fop.IN.value,
-        fop.IS.value,
-        fop.TYPE_IS.value,
-    ],
-    FieldType.FLOAT.value: [
-        fop.BETWEEN.value,
-        fop.GREATER_THAN.value,
-        fop.IN.value,
-        fop.IS.value,
-        fop.LESS_THAN.value,
-    ],
-    FieldType.MULTI_ENTITY.value: [
-        fop.IN.value,
-        fop.IS.value,
-        fop.TYPE_IS.value,
-    ],
-    FieldType.NUMBER.value: [
-        fop.BETWEEN.value,
-        fop.GREATER_THAN.value,
-        fop.IN.value,
-        fop.IS.value,
-        fop.LESS_THAN.value,
-    ],
-    FieldType.TEXT.value: [
-        fop.CONTAINS.value,
-        fop.ENDS_WITH.value,
-        fop.IS.value,
-        fop.IN.value,
-        fop.STARTS_WITH.value,
-    ],
-    FieldType.TEXT_LIST.value: [
-        fop.CONTAINS.value,
-        fop.ENDS_WITH.value,
-        fop.IS.value,
-        fop.IN.value,
-        fop.STARTS_WITH.value,
-    ],
+    FieldType.BOOL.value: frozenset(
+        {
+            fop.IS.value,
+        }
+    ),
+    FieldType.DATE.value: frozenset(
+        {
+            fop.BETWEEN.value,
+            fop.GREATER_THAN.value,
+            fop.LESS_THAN.value,
+            fop.IN_CALENDAR.value,
+            fop.IN.value,
+            fop.IS.value,
+            fop.IN_LAST.value,
+            fop.IN_NEXT.value,
+        }
+    ),
+    FieldType.DATE_TIME.value: frozenset(
+        {
+            fop.BETWEEN.value,
+            fop.GREATER_THAN.value,
+            fop.LESS_THAN.value,
+            fop.IN_CALENDAR.value,
+            fop.IN.value,
+            fop.IS.value,
+            fop.IN_LAST.value,
+            fop.IN_NEXT.value,
+        }
+    ),
+    FieldType.ENTITY.value: frozenset(
+        {
+            fop.IN.value,
+            fop.IS.value,
+            fop.TYPE_IS.value,
+        }
+    ),
+    FieldType.FLOAT.value: frozenset(
+        {
+            fop.BETWEEN.value,
+            fop.GREATER_THAN.value,
+            fop.IN.value,
+            fop.IS.value,
+            fop.LESS_THAN.value,
+        }
+    ),
+    FieldType.MULTI_ENTITY.value: frozenset(
+        {
+            fop.IN.value,
+            fop.IS.value,
+            fop.TYPE_IS.value,
+        }
+    ),
+    FieldType.NUMBER.value: frozenset(
+        {
+            fop.BETWEEN.value,
+            fop.GREATER_THAN.value,
+            fop.IN.value,
+            fop.IS.value,
+            fop.LESS_THAN.value,
+        }
+    ),
+    FieldType.TEXT.value: frozenset(
+        {
+            fop.CONTAINS.value,
+            fop.ENDS_WITH.value,
+            fop.IS.value,
+            fop.IN.value,
+            fop.STARTS_WITH.value,
+        }
+    ),
+    FieldType.TEXT_LIST.value: frozenset(
+        {
+            fop.CONTAINS.value,
+            fop.ENDS_WITH.value,
+            fop.IS.value,
+            fop.IN.value,
+            fop.STARTS_WITH.value,
+        }
+    ),
 }
 
 
+@functools.lru_cache(maxsize=4096)
 def parse_deep_field(return_field: str) -> DeepField:
-    """Parse the given deep return field."""
+    """Parse the given deep return field.
 
-    try:
-        head, entity_type, tail = return_field.split(DEEP_FIELD_SEP, 2)
-    except ValueError:
+    The same fields recur across queries, so the results are cached.
+    """
+
+    head, __, rest = return_field.partition(DEEP_FIELD_SEP)
+    entity_type, sep, tail = rest.partition(DEEP_FIELD_SEP)
+
+    if not sep:
         raise FilterSpecError("Deep field must have at least three values.")
 
     return DeepField(head, entity_type, tail)
@@ -136,7 +168,7 @@ def is_deep_field(field_name: str) -> bool:
 def is_entity(field_schema: dict) -> bool:
     """Return true if the given field is an entity field."""
 
-    return field_schema["type"] == FieldType.ENTITY.value
+    return field_schema["type"] == _ENTITY
 
 
 def is_link(field_schema: dict) -> bool:
@@ -148,7 +180,7 @@ def is_link(field_schema: dict) -> bool:
 def is_multi_entity(field_schema: dict) -> bool:
     """Return true if the given field is an entity field."""
 
-    return field_schema["type"] == FieldType.MULTI_ENTITY.value
+    return field_schema["type"] == _MULTI_ENTITY
 
 
 def _field_type(field_spec: dict) -> str:
@@ -164,15 +196,13 @@ def _field_type(field_spec: dict) -> str:
         str
     """
 
-    data_types = ", ".join([each.value for each in FieldType])
-
     try:
         data_type = field_spec["type"]
     except KeyError:
-        raise ValueError(f"Field properties must include 'type' - {data_types}.")
+        raise ValueError(f"Field properties must include 'type' - {_FIELD_TYPES_STR}.")
     else:
-        if data_type not in data_types:
-            raise ValueError(f"Invalid data type '{data_type}' - expected {data_types}.")
+        if data_type not in _FIELD_TYPES:
+            raise ValueError(f"Invalid data type '{data_type}' - expected {_FIELD_TYPES_STR}.")
 
     return data_type
 
@@ -184,12 +214,10 @@ def conform_spec(field_spec):
         field_spec (dict): Entity field spec.
     """
 
-    data_type = _field_type(field_spec)
+    conform_func = _CONFORM_FUNC.get(_field_type(field_spec))
 
-    try:
-        _CONFORM_FUNC[data_type](field_spec)
-    except KeyError:
-        pass
+    if conform_func is not None:
+        conform_func(field_spec)
 
 
 def _conform_entity(properties):
@@ -248,8 +276,9 @@ def _handle_date(value, field_spec):
         else:
             return None, True
 
+    # The year is always padded to four digits, as DATE_FORMAT reads on every platform.
     if isinstance(value, datetime.date):
-        return value.strftime(DATE_FORMAT), True
+        return f"{value.year:04d}-{value.month:02d}-{value.day:02d}", True
     else:
         raise ValueError("Must provide a date.")
 
@@ -264,7 +293,10 @@ def _handle_date_time(value, field_spec):
             return None, True
 
     if isinstance(value, datetime.datetime):
-        return value.strftime(DATE_TIME_FORMAT), True
+        return (
+            f"{value.year:04d}-{value.month:02d}-{value.day:02d} "
+            f"{value.hour:02d}:{value.minute:02d}:{value.second:02d}"
+        ), True
     else:
         return value, False
 
@@ -328,16 +360,48 @@ def _handle_json(value, field_spec):
     if value is None:
         return None, True
 
-    try:
-        json.dumps(value)
+    invalid_type = _find_non_json_type(value, set())
 
+    if invalid_type is None:
         return value, True
-    except TypeError as exc:
+    else:
         raise ValueError(
-            f"JSON field '{field_spec['entity_type']}.{field_spec['name']}' expects a valid JSON object - {exc}."
+            f"JSON field '{field_spec['entity_type']}.{field_spec['name']}' expects a valid JSON object - "
+            f"Object of type {invalid_type.__name__} is not JSON serializable."
         )
 
 
+def _find_non_json_type(value, parents):
+    # Same checks as json.dumps, without serializing the value.
+    if isinstance(value, _JSON_SCALAR_TYPES):
+        return None
+    elif isinstance(value, dict):
+        for key in value:
+            if not isinstance(key, _JSON_SCALAR_TYPES):
+                return type(key)
+
+        items = value.values()
+    elif isinstance(value, (list, tuple)):
+        items = value
+    else:
+        return type(value)
+
+    if id(value) in parents:
+        raise ValueError("Circular reference detected")
+
+    parents.add(id(value))
+
+    for each in items:
+        invalid_type = _find_non_json_type(each, parents)
+
+        if invalid_type is not None:
+            return invalid_type
+
+    parents.discard(id(value))
+
+    return None
+
+
 def _handle_number(value, field_spec):
     if value is None:
         return field_spec.get("default"), True
@@ -355,17 +419,18 @@ def _handle_multi_entity(value, field_spec):
         return None, True
 
     results = []
-    is_valid = True
+    append = results.append
+    handle = _handle_entity
 
     for each in value:
-        result, is_valid = _handle_entity(each, field_spec)
+        result, is_valid = handle(each, field_spec)
 
-        if is_valid:
-            results.append(result)
-        else:
-            break
+        if not is_valid:
+            return value, False
+
+        append(result)
 
-    return results, is_valid
+    return results, True
 
 
 def _handle_text(value, field_spec):
@@ -385,17 +450,18 @@ def _handle_text_list(value, field_spec):
         return None, True
 
     results = []
-    is_valid = True
+    append = results.append
+    handle = _handle_text
 
     for each in value:
-        result, is_valid = _handle_text(each, field_spec)
+        result, is_valid = handle(each, field_spec)
 
-        if is_valid:
-            results.append(result)
-        else:
-            break
+        if not is_valid:
+            return value, False
+
+        append(result)
 
-    return results, is_valid
+    return results, True
 
 
 def update_multi_entity_field(
@@ -413,24 +479,19 @@ def update_multi_entity_field(
     """
 
     update_mode = update_mode or UpdateMode.SET.value
-    links = collections.OrderedDict()
 
     as_key = tinysg.utils.as_key
 
-    for each in old_values:
-        links[as_key(each)] = dict(each)
-
-    if update_mode == UpdateMode.ADD.value:
-        for each in new_values:
-            links[as_key(each)] = each
-    elif update_mode == UpdateMode.SET.value:
-        links.clear()
-
-        for each in new_values:
-            links[as_key(each)] = each
+    if update_mode == UpdateMode.SET.value:
+        links = dict(zip(map(as_key, new_values), new_values))
+    elif update_mode == UpdateMode.ADD.value:
+        links = {as_key(each): dict(each) for each in old_values}
+        links.update(zip(map(as_key, new_values), new_values))
     elif update_mode == UpdateMode.REMOVE.value:
-        for each in new_values:
-            links.pop(as_key(each), None)
+        links = {as_key(each): dict(each) for each in old_values}
+
+        for key in map(as_key, new_values):
+            links.pop(key, None)
     else:
         raise ValueError(f"Unsupported update mode: {update_mode}.")
 
@@ -561,7 +622,7 @@ _HANDLER_FUNC = {
 
 _CONFORM_FUNC = {
     FieldType.ENTITY.value: _conform_entity,
-    FieldType.ENTITY.value: _conform_entity,
+    FieldType.MULTI_ENTITY.value: _conform_entity,
 }
 
 _VALIDATOR_FUNC = {
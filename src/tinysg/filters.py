@@ -2,17 +2,17 @@
 
 from __future__ import annotations
 
-import functools
+import calendar
 import collections
 import datetime
-import dateutil.relativedelta
+import functools
 import operator
 
 import tinysg.entity
 import tinysg.utils
 
 from enum import Enum
-from typing import Any, Callable, Iterable, List, Union
+from typing import Any, Callable, Iterable, List, Mapping, Tuple, Union
 from tinysg.exceptions import FilterSpecError
 
 DateOrDateTime = Union[datetime.date, datetime.datetime]
@@ -68,33 +68,107 @@ class FilterOperator(Enum):
 
 FILTER_OPERATORS = {}
 
+# Value types that the native comparison operators can be used for.
+SCALAR_TYPES = (bool, int, float, str)
+
+# Filter operators that compare a field value with a scalar value, by the operator that
+# takes the filter value first - e.g. 'a > b' is 'b < a'.
+NATIVE_FILTER_OPERATORS = {
+    FilterOperator.IS.value: operator.eq,
+    FilterOperator.IS_NOT.value: operator.ne,
+    FilterOperator.GREATER_THAN.value: operator.lt,
+    FilterOperator.LESS_THAN.value: operator.gt,
+}
+
+# Filter operators that compare a field value with today's date, so what they match
+# changes from one day to the next.
+DATE_RELATIVE_FILTER_OPERATORS = frozenset(
+    [
+        FilterOperator.IN_CALENDAR.value,
+        FilterOperator.IN_LAST.value,
+        FilterOperator.IN_NEXT.value,
+        FilterOperator.NOT_IN_CALENDAR.value,
+        FilterOperator.NOT_IN_LAST.value,
+        FilterOperator.NOT_IN_NEXT.value,
+    ]
+)
 
-def neg(func):
-    """Negate the wrapped function."""
-
-    @functools.wraps(func)
-    def wrapper(*args, **kwargs):
-        return not func(*args, **kwargs)
 
-    return wrapper
+def register(*fops: str, factory: bool = False) -> Callable:
+    """Register the decorated function to the given filter operators.
 
+    A filter function is called with the field value followed by the filter values. A
+    filter factory is called once per query with the filter values, and returns the
+    filter function for the field value.
 
-def register(*fops: str) -> Callable:
-    """Register the decorated function to the given filter operators."""
+    Operators starting with 'not_' or ending with '_not' are registered as negated.
+    """
 
     def inner(func):
+        build = _negatable(func) if factory else _bind(func)
+
         for fop in fops:
-            if fop.startswith("not_"):
-                FILTER_OPERATORS[fop] = neg(func)
-            elif fop.endswith("_not"):
-                FILTER_OPERATORS[fop] = neg(func)
-            else:
-                FILTER_OPERATORS[fop] = func
+            negate = fop.startswith("not_") or fop.endswith("_not")
+            FILTER_OPERATORS[fop] = (build, negate)
+
         return func
 
     return inner
 
 
+def _bind(func: Callable) -> Callable:
+    """Return a filter factory that binds the filter values to the given filter function.
+
+    The negation is part of the returned filter, rather than a call wrapped around it.
+    """
+
+    def build(*args, negate: bool = False):
+        if len(args) == 1:
+            (arg,) = args
+
+            if negate:
+                return lambda value: not func(value, arg)
+            else:
+                return lambda value: func(value, arg)
+
+        if negate:
+            return lambda value: not func(value, *args)
+        else:
+            return lambda value: func(value, *args)
+
+    return build
+
+
+def _negatable(factory: Callable) -> Callable:
+    """Return a filter factory that negates the filters of the given factory on request."""
+
+    def build(*args, negate: bool = False):
+        test = factory(*args)
+
+        if negate:
+            return lambda value: not test(value)
+        else:
+            return test
+
+    return build
+
+
+def _affix_filter(method: str) -> Callable:
+    """Return a filter factory for the given str prefix/suffix method.
+
+    The filter calls the str method directly, without a Python frame around it. A list
+    of affixes matches any of them, as the str methods do for a tuple.
+    """
+
+    def factory(affix) -> Callable[[str], bool]:
+        if isinstance(affix, list):
+            affix = tuple(affix)
+
+        return operator.methodcaller(method, affix)
+
+    return factory
+
+
 def parse_filter_spec(filter_spec: List) -> FilterSpec:
     """Parse the given filter spec is valid.
 
@@ -118,8 +192,27 @@ def parse_filter_spec(filter_spec: List) -> FilterSpec:
     return FilterSpec(field, filter_op, filter_value)
 
 
-def get(filter_op) -> Callable:
-    """Return the query for the given filter_spec.
+def is_date_relative(filter_specs: Iterable[List]) -> bool:
+    """Return True if any of the given filter specs compare with today's date.
+
+    Args:
+        filter_specs (list[list]): Filter specs to check.
+
+    Returns:
+        bool
+    """
+
+    return any(
+        len(filter_spec) > 1 and filter_spec[1] in DATE_RELATIVE_FILTER_OPERATORS
+        for filter_spec in filter_specs
+    )
+
+
+def get(filter_op) -> Tuple[Callable, bool]:
+    """Return the filter factory for the given filter operator, and if it is negated.
+
+    The factory is called with the filter values and the negate flag, and returns the
+    filter function for the field value.
 
     Args:
         filter_op (str): Filter operator spec.
@@ -128,7 +221,7 @@ def get(filter_op) -> Callable:
         tinysg.exceptions.FilterSpecError: If the given filter op is not supported.
 
     Returns:
-        callable
+        tuple[callable, bool]
     """
 
     try:
@@ -140,6 +233,74 @@ def get(filter_op) -> Callable:
         )
 
 
+def compile(filter_specs: Iterable[List]) -> Callable[[Mapping], bool]:
+    """Return a single filter function for the given filter specs.
+
+    Each filter is resolved once, so an entity is tested with one call no matter how
+    many filters there are. An entity without one of the filtered fields never matches.
+
+    Args:
+        filter_specs (list[list]): Filter specs to match every one of.
+
+    Raises:
+        tinysg.exceptions.FilterSpecError: If a filter spec is not the right shape.
+        tinysg.exceptions.FilterSpecError: If a filter op is not supported.
+
+    Returns:
+        callable
+    """
+
+    tests = tuple(_compile_filter_spec(filter_spec) for filter_spec in filter_specs)
+
+    if len(tests) == 1:
+        ((field, test),) = tests
+
+        def run_one(entity: Mapping) -> bool:
+            try:
+                value = entity[field]
+            except (KeyError, TypeError):
+                return False
+
+            return test(value)
+
+        return run_one
+
+    def run_all(entity: Mapping) -> bool:
+        for field, test in tests:
+            try:
+                value = entity[field]
+            except (KeyError, TypeError):
+                return False
+
+            if not test(value):
+                return False
+
+        return True
+
+    return run_all
+
+
+def _compile_filter_spec(filter_spec: List) -> Tuple[str, Callable[[Any], bool]]:
+    """Return the field and filter function for the given filter spec.
+
+    Comparisons with a single scalar value use the C operator directly, bound to the
+    filter value.
+    """
+
+    field, filter_op, filter_value = parse_filter_spec(filter_spec)
+    build, negate = get(filter_op)
+
+    native_op = NATIVE_FILTER_OPERATORS.get(filter_op)
+
+    if native_op is not None and len(filter_value) == 1:
+        (value,) = filter_value
+
+        if isinstance(value, SCALAR_TYPES):
+            return field, functools.partial(native_op, value)
+
+    return field, build(*filter_value, negate=negate)
+
+
 @register(
     FilterOperator.BETWEEN.value,
     FilterOperator.NOT_BETWEEN.value,
@@ -156,7 +317,7 @@ def between(a, mn, mx) -> bool:
         bool
     """
 
-    return mn < a and a < mx
+    return mn < a < mx
 
 
 @register(
@@ -172,7 +333,8 @@ def contains(a, b) -> bool:
 register(
     FilterOperator.ENDS_WITH.value,
     FilterOperator.NOT_ENDS_WITH.value,
-)(str.endswith)
+    factory=True,
+)(_affix_filter("endswith"))
 
 
 register(
@@ -183,12 +345,14 @@ register(
 @register(
     FilterOperator.IN_CALENDAR.value,
     FilterOperator.NOT_IN_CALENDAR.value,
+    factory=True,
 )
-def in_calendar(value: DateOrDateTime, n: int, unit: str) -> bool:
-    """Return True if 'value' is on the 'n' calendar unit from today.
+def in_calendar(n: int, unit: str) -> Callable[[DateOrDateTime], bool]:
+    """Return a filter for dates on the 'n' calendar unit from today.
+
+    Weeks are counted in whole weeks from today, rather than from the start of the week.
 
     Args:
-        value (datetime.date | datetime.datetime): Date/Datetime to test.
         n (int): Offset in time units (0 = today, 1 = next, -1 = last)
         units (str): Units of time (DAY, WEEK, MONTH, or YEAR)
 
@@ -196,115 +360,260 @@ def in_calendar(value: DateOrDateTime, n: int, unit: str) -> bool:
         ValueError: If 'units' is not 'DAY', 'WEEK', 'MONTH', or 'YEAR'
 
     Returns:
-        bool
+        callable
     """
 
-    today = tinysg.utils.today()
+    _check_unit(unit)
 
-    if unit == CalendarUnits.MONTH.value:
-        # relativedelta does not correctly express the idea of
-        # "last month" or "next month" for dates during the month.
-        delta = dateutil.relativedelta.relativedelta(
-            dt1=datetime.date(value.year, value.month, 1),
-            dt2=datetime.date(today.year, today.month, 1),
-        )
-    else:
-        delta = dateutil.relativedelta.relativedelta(
-            dt1=value,
-            dt2=today,
-        )
+    get_key = _CALENDAR_KEYS[unit]
+    get_range = _bounds_per_day(lambda today: _calendar_range(today, n, unit))
 
-    try:
-        return getattr(delta, unit.lower() + "s") == n
-    except AttributeError:
-        raise ValueError(
-            f"Invalidate unit: '{unit}' - expected {', '.join(CalendarUnits.values())}."
-        )
+    def test(value: DateOrDateTime) -> bool:
+        start, end = get_range(tinysg.utils.today_cached())
+
+        return start <= get_key(value) <= end
+
+    return test
 
 
 @register(
     FilterOperator.IN_LAST.value,
     FilterOperator.NOT_IN_LAST.value,
+    factory=True,
 )
-def in_last(value: DateOrDateTime, n: int, unit: str) -> bool:
-    """Return True if 'date' is within the last N units.
+def in_last(n: int, unit: str) -> Callable[[DateOrDateTime], bool]:
+    """Return a filter for dates within the last N units.
 
     Args:
-        value (datetime.date | datetime.datetime): Date/Datetime to test.
-        n (int): Number of hours/days/weeks/months/years
-        unit (str): Units of time (HOUR, DAY, WEEK, MONTH, or YEAR)
+        n (int): Number of days/weeks/months/years
+        unit (str): Units of time (DAY, WEEK, MONTH, or YEAR)
 
     Raises:
-        ValueError: If 'units' is not 'HOUR', 'DAY', 'WEEK', 'MONTH', or 'YEAR'
+        ValueError: If 'units' is not 'DAY', 'WEEK', 'MONTH', or 'YEAR'
         ValueError: If 'n' is less than 0.
 
     Returns:
-        bool
+        callable
     """
 
-    if n < 0:
-        raise ValueError(f"Number of {unit.lower()}s must be greater than zero.")
+    _check_window(n, unit)
 
-    today = tinysg.utils.today()
-    key = unit.lower() + "s"
+    get_range = _bounds_per_day(lambda today: (_shift(today, -n, unit), today.toordinal()))
 
-    try:
-        delta = dateutil.relativedelta.relativedelta(**{key: n})
-    except TypeError:
-        raise ValueError(
-            f"Invalidate unit: '{unit}' - expected HOUR, {', '.join(CalendarUnits.values())}."
-        )
+    def test(value: DateOrDateTime) -> bool:
+        start, end = get_range(tinysg.utils.today_cached())
 
-    return today - delta <= value <= today
+        return start <= value.toordinal() <= end
+
+    return test
 
 
 @register(
     FilterOperator.IN_NEXT.value,
     FilterOperator.NOT_IN_NEXT.value,
+    factory=True,
 )
-def in_next(value: Union[datetime.date, datetime.datetime], n: int, unit: str) -> bool:
-    """Return True if 'date' is within the next N units.
+def in_next(n: int, unit: str) -> Callable[[DateOrDateTime], bool]:
+    """Return a filter for dates within the next N units.
 
     Args:
-        value (datetime.date | datetime.datetime): Date/Datetime to test.
-        n (int): Number of hours/days/weeks/months/years
-        unit (str): Units of time (HOUR, DAY, WEEK, MONTH, or YEAR)
+        n (int): Number of days/weeks/months/years
+        unit (str): Units of time (DAY, WEEK, MONTH, or YEAR)
 
     Raises:
-        ValueError: If 'units' is not 'HOUR', 'DAY', 'WEEK', 'MONTH', or 'YEAR'
+        ValueError: If 'units' is not 'DAY', 'WEEK', 'MONTH', or 'YEAR'
         ValueError: If 'n' is less than 0.
 
     Returns:
-        bool
+        callable
     """
 
-    if n < 0:
-        raise ValueError(f"Number of {unit.lower()}s must be greater than zero.")
+    _check_window(n, unit)
 
-    today = tinysg.utils.today()
-    key = unit.lower() + "s"
+    get_range = _bounds_per_day(lambda today: (today.toordinal(), _shift(today, n, unit)))
 
-    try:
-        delta = dateutil.relativedelta.relativedelta(**{key: n})
-    except TypeError:
+    def test(value: DateOrDateTime) -> bool:
+        start, end = get_range(tinysg.utils.today_cached())
+
+        return start <= value.toordinal() <= end
+
+    return test
+
+
+def _check_unit(unit: str):
+    """Check the given calendar unit is valid.
+
+    Raises:
+        ValueError: If 'units' is not 'DAY', 'WEEK', 'MONTH', or 'YEAR'
+    """
+
+    if unit not in CalendarUnits.values():
         raise ValueError(
-            f"Invalidate unit: '{unit}' - expected HOUR, {', '.join(CalendarUnits.values())}."
+            f"Invalidate unit: '{unit}' - expected {', '.join(CalendarUnits.values())}."
         )
 
-    return today <= value <= today + delta
+
+def _check_window(n: int, unit: str):
+    """Check the given number of calendar units is valid.
+
+    Raises:
+        ValueError: If 'units' is not 'DAY', 'WEEK', 'MONTH', or 'YEAR'
+        ValueError: If 'n' is less than 0.
+    """
+
+    if n < 0:
+        raise ValueError(f"Number of {unit.lower()}s must be greater than zero.")
+
+    _check_unit(unit)
+
+
+def _month_index(value: DateOrDateTime) -> int:
+    """Return the number of months since the start of the calendar for the given date."""
+
+    return value.year * 12 + value.month - 1
+
+
+def _calendar_range(today: datetime.date, n: int, unit: str) -> Tuple[int, int]:
+    """Return the range of calendar keys that are 'n' calendar units from today.
+
+    Days and weeks are ordinal days, months are month indices, and years are years -
+    see _CALENDAR_KEYS.
+    """
+
+    if unit == CalendarUnits.DAY.value:
+        start = end = today.toordinal() + n
+    elif unit == CalendarUnits.WEEK.value:
+        start = end = today.toordinal() + n * 7
+
+        if n >= 0:
+            end += 6
+        if n <= 0:
+            start -= 6
+    elif unit == CalendarUnits.MONTH.value:
+        start = end = _month_index(today) + n
+    else:
+        start = end = today.year + n
+
+    return start, end
+
+
+def _shift(today: datetime.date, n: int, unit: str) -> int:
+    """Return the ordinal day 'n' calendar units from today.
+
+    Months and years are clamped to the end of the month, as in dateutil's relativedelta.
+    """
+
+    if unit == CalendarUnits.DAY.value:
+        return today.toordinal() + n
+    elif unit == CalendarUnits.WEEK.value:
+        return today.toordinal() + n * 7
+
+    months = n * 12 if unit == CalendarUnits.YEAR.value else n
+    year, month = divmod(_month_index(today) + months, 12)
+    day = min(today.day, calendar.monthrange(year, month + 1)[1])
+
+    return datetime.date(year, month + 1, day).toordinal()
+
+
+_CALENDAR_KEYS = {
+    CalendarUnits.DAY.value: operator.methodcaller("toordinal"),
+    CalendarUnits.WEEK.value: operator.methodcaller("toordinal"),
+    CalendarUnits.MONTH.value: _month_index,
+    CalendarUnits.YEAR.value: operator.attrgetter("year"),
+}
+
+
+def _bounds_per_day(func: Callable[[datetime.date], Any]) -> Callable[[datetime.date], Any]:
+    """Return the given bounds function, computed once for each day it is called with.
+
+    Date filters are evaluated once per entity, so this keeps the date arithmetic out
+    of the per-entity cost, while still following the date if it changes between queries.
+    """
+
+    state = (None, None)
+
+    def get_bounds(today: datetime.date) -> Any:
+        nonlocal state
+
+        day, bounds = state
+
+        if day != today:
+            bounds = func(today)
+            state = (today, bounds)
+
+        return bounds
+
+    return get_bounds
 
 
 @register(
     FilterOperator.IN.value,
     FilterOperator.NOT_IN.value,
+    factory=True,
 )
-def in_(a, b):
-    """Return True if 'a' is in 'b'."""
+def in_(b) -> Callable[[Any], bool]:
+    """Return a filter for values in 'b'.
 
-    if isinstance(a, (list, tuple)):
-        return any([a_ in b for a_ in a])
-    else:
-        return a in b
+    If every value in 'b' is hashable, they are tested as a set. A list of entities is
+    tested as a set of their (type, id) keys, as 'is' compares entities. Otherwise, 'b'
+    is tested as a list.
+    """
+
+    if isinstance(b, (list, tuple, set, frozenset)):
+        try:
+            b = frozenset(b)
+        except TypeError:
+            if b and all(map(_is_entity, b)):
+                return _in_entities(frozenset(map(tinysg.utils.as_key, b)))
+
+    if not isinstance(b, frozenset):
+
+        def test(a) -> bool:
+            if isinstance(a, (list, tuple)):
+                return any(a_ in b for a_ in a)
+            else:
+                return a in b
+
+        return test
+
+    def contains(a) -> bool:
+        try:
+            return a in b
+        except TypeError:
+            # An unhashable value is never in a set of hashable values.
+            return False
+
+    def test_set(a) -> bool:
+        if isinstance(a, (list, tuple)):
+            try:
+                return not b.isdisjoint(a)
+            except TypeError:
+                return any(map(contains, a))
+        else:
+            return contains(a)
+
+    return test_set
+
+
+def _in_entities(keys: frozenset) -> Callable[[Any], bool]:
+    """Return a filter for entities, or lists of entities, with one of the given keys."""
+
+    def contains(a) -> bool:
+        return _is_entity(a) and tinysg.utils.as_key(a) in keys
+
+    def test(a) -> bool:
+        if isinstance(a, (list, tuple)):
+            return any(map(contains, a))
+        else:
+            return contains(a)
+
+    return test
+
+
+def _is_entity(value: Any) -> bool:
+    """Return True if the given value is an entity."""
+
+    return isinstance(value, dict) and "id" in value and "type" in value
 
 
 @register(
@@ -314,11 +623,6 @@ def in_(a, b):
 def is_(a, b):
     """Return True if 'a' equal to 'b'."""
 
-    def _is_entity(value: Any) -> bool:
-        """Return True if the given value is an entity."""
-
-        return isinstance(value, dict) and "id" in value and "type" in value
-
     def _is_entity_list(value: Iterable) -> bool:
         """Return True if the given value is an entity list."""
 
@@ -340,7 +644,8 @@ register(
 register(
     FilterOperator.STARTS_WITH.value,
     FilterOperator.NOT_STARTS_WITH.value,
-)(str.startswith)
+    factory=True,
+)(_affix_filter("startswith"))
 
 
 @register(
@@ -1,14 +1,14 @@
 """Database middleware."""
 
 import collections
-import frozendict
 import operator
 
 from tinydb.middlewares import CachingMiddleware, Middleware
-from typing import Tuple
+from typing import List, Mapping, Tuple
 
 import tinysg.fields
-import tinysg.utils
+
+_get_first = operator.itemgetter(0)
 
 
 class ReadCachingMiddleware(CachingMiddleware):
@@ -23,7 +23,14 @@ class ReadCachingMiddleware(CachingMiddleware):
         self.storage.write(data)
 
     def flush(self):
-        """Flush data from the cache."""
+        """Flush data from the cache.
+
+        Nothing is written if the cache has not been read since the last write. Once it
+        has been read, it is written on every flush, whether it was edited or not.
+        """
+
+        if self.cache is None:
+            return
 
         self.write(self.cache)
         self.read()
@@ -49,86 +56,112 @@ class PivotTableMiddleware(Middleware):
         data = self.storage.read()
 
         schema = data.get("_schema", {})
-        fields = data.setdefault("_fields", {})
-
-        entity_fields = collections.defaultdict(list)
-
-        for field in fields.values():
-            entity_type = field["entity_type"]
-
-            entity_fields[entity_type].append(field)
+        entity_fields = _group_fields(data.setdefault("_fields", {}))
 
         link_tables = set()
 
         for entity_info in schema.values():
             entity_type = entity_info["entity_type"]
-            entity_info["fields"] = entity_fields[entity_type]
 
             table = data.get(entity_type, {})
             retired = data.get(f"Retired:{entity_type}", {})
 
-            for entity_id, entity in table.items():
-                if str(entity_id) not in retired:
-                    entity["id"] = int(entity_id)
-                    entity["type"] = entity_type
+            joins = []
 
             for field in entity_fields[entity_type]:
                 if tinysg.fields.is_link(field):
-                    self._join(data, entity_type, field)
                     link_tables.add(field["table"])
+                    links_map = self._join(data, field)
+
+                    if links_map:
+                        joins.append((field["name"], tinysg.fields.is_entity(field), links_map))
+
+            # Each entity is visited once, to set its id and type and its link fields.
+            for entity_id, entity in table.items():
+                if not retired or entity_id not in retired:
+                    entity["id"] = int(entity_id)
+                    entity["type"] = entity_type
+
+                for field_name, is_entity, links_map in joins:
+                    links = links_map.get(entity_id)
+
+                    if links is None:
+                        continue
+                    elif is_entity:
+                        entity[field_name] = links[0]
+                    else:
+                        entity[field_name] = links
 
         for each in link_tables:
             data.pop(each, None)
 
         return data
 
-    def _join(self, data: dict, entity_type: str, field: dict) -> None:
-        """Join the link field pivot table with the entity data.
+    def _join(self, data: dict, field: dict) -> Mapping[str, List[dict]]:
+        """Return the links in the pivot table of the given link field.
 
         Args:
             data (dict): In memory database contents.
-            entity_type (str): Entity type to perform the join on.
             field (dict): Spec for the link field to join the pivot table of.
-        """
 
-        this_entity_type = entity_type
-        this_entity_table = data.get(this_entity_type, {})
+        Returns:
+            dict[str, list[dict]]: Links sorted by id, by the id of the entity they are on.
+        """
 
-        link_entity_type = field["link"]
         link_entity_table = data.get(field["table"], {})
 
-        linked_entity_list = collections.defaultdict(list)
-
         this_key = self._this_key(field)
         link_keys = self._link_keys(field)
 
-        for link in link_entity_table.values():
-            this_entity_id = int(link[this_key])
+        # The links are collected as ids, and only built as entities once sorted.
+        if len(link_keys) == 1:
+            # Most link fields link a single entity type, so skip the loop over link types.
+            ((link_entity_type, link_key),) = link_keys.items()
 
-            for link_entity_type, link_key in link_keys.items():
+            linked_ids = collections.defaultdict(list)
+
+            for link in link_entity_table.values():
                 try:
-                    link_entity_id = int(link[link_key])
+                    link_entity_id = link[link_key]
                 except KeyError:
                     continue
                 else:
-                    link_entity = {"type": link_entity_type, "id": link_entity_id}
-                    linked_entity_list[this_entity_id].append(link_entity)
+                    linked_ids[link[this_key]].append(link_entity_id)
 
-        for entity_id, entity in this_entity_table.items():
-            links = linked_entity_list.get(int(entity_id))
+            for ids in linked_ids.values():
+                if len(ids) > 1:
+                    ids.sort()
 
-            if links is None:
-                continue
+            # Table keys are strings, so the map is keyed the same way.
+            return {
+                str(entity_id): [{"type": link_entity_type, "id": each} for each in ids]
+                for entity_id, ids in linked_ids.items()
+            }
 
-            links.sort(key=operator.itemgetter("id"))
+        linked_keys = collections.defaultdict(list)
 
-            if tinysg.fields.is_entity(field):
-                entity[field["name"]] = tinysg.utils.first(links)
-            elif tinysg.fields.is_multi_entity(field):
-                entity[field["name"]] = links
+        for link in link_entity_table.values():
+            this_entity_id = link[this_key]
+
+            for link_entity_type, link_key in link_keys.items():
+                try:
+                    link_entity_id = link[link_key]
+                except KeyError:
+                    continue
+                else:
+                    linked_keys[this_entity_id].append((link_entity_id, link_entity_type))
+
+        for keys in linked_keys.values():
+            if len(keys) > 1:
+                keys.sort(key=_get_first)
+
+        return {
+            str(entity_id): [{"type": link_type, "id": link_id} for link_id, link_type in keys]
+            for entity_id, keys in linked_keys.items()
+        }
 
     def _this_key(self, field: dict) -> str:
-        return "{entity_type}.{name}".format(**field)
+        return f"{field['entity_type']}.{field['name']}"
 
     def _link_keys(self, field: dict) -> Tuple[str, str]:
         result = {}
@@ -137,7 +170,7 @@ class PivotTableMiddleware(Middleware):
 
         for each in field["link"]:
             try:
-                link_key = "{}.{}".format(each, link_fields[each])
+                link_key = f"{each}.{link_fields[each]}"
             except KeyError:
                 link_key = each
 
@@ -153,58 +186,86 @@ class PivotTableMiddleware(Middleware):
         """
 
         schema = data.get("_schema", {})
-
-        fields = collections.defaultdict(list)
-
-        for field in data.get("_fields", {}).values():
-            entity_type = field["entity_type"]
-
-            fields[entity_type].append(field)
+        fields = _group_fields(data.get("_fields", {}))
 
         link_tables = collections.defaultdict(set)
 
         for entity_info in schema.values():
             entity_type = entity_info["entity_type"]
 
+            # Older databases have the fields copied in the schema, which is never read.
+            entity_info.pop("fields", None)
+
             table = data.get(entity_type, {})
 
             drop_field_names = ["id", "type"]
             link_fields = []
 
+            # The pivot table keys are the same for every entity, so they are built once.
             for field in fields[entity_type]:
                 if tinysg.fields.is_link(field):
                     drop_field_names.append(field["name"])
-                    link_fields.append(field)
+                    link_fields.append(
+                        (
+                            field["name"],
+                            field["table"],
+                            tinysg.fields.is_entity(field),
+                            self._this_key(field),
+                            self._link_keys(field),
+                        )
+                    )
 
-            for __, entity in table.items():
+            for entity in table.values():
                 if not entity:
                     continue
 
-                for field in link_fields:
-                    this_key = self._this_key(field)
-                    link_keys = self._link_keys(field)
+                for field_name, table_name, is_entity, this_key, link_keys in link_fields:
+                    value = entity.get(field_name)
 
-                    if tinysg.fields.is_entity(field):
-                        links = [entity.get(field["name"])]
-                    elif tinysg.fields.is_multi_entity(field):
-                        links = entity.get(field["name"]) or []
+                    if not value:
+                        continue
 
-                    links = [link for link in links if link]
+                    links = [value] if is_entity else value
 
                     for link in links:
+                        if not link:
+                            continue
+
                         link_key = link_keys[link["type"]]
-                        link_dict = frozendict.frozendict(
-                            {link_key: link["id"], this_key: entity["id"]}
-                        )
 
-                        link_tables[field["table"]].add(link_dict)
+                        # Both sides of a bi-directional link write the same row, so the
+                        # keys are ordered to let the set de-duplicate them.
+                        if this_key < link_key:
+                            row = (this_key, entity["id"], link_key, link["id"])
+                        else:
+                            row = (link_key, link["id"], this_key, entity["id"])
+
+                        link_tables[table_name].add(row)
 
                 for field_name in drop_field_names:
                     entity.pop(field_name, None)
 
         for table, links in sorted(link_tables.items()):
-            data[table] = {i: dict(link) for i, link in enumerate(links, 1)}
+            data[table] = {
+                i: {key_a: id_a, key_b: id_b}
+                for i, (key_a, id_a, key_b, id_b) in enumerate(links, 1)
+            }
 
         self.storage.write(data)
 
         return data
+
+
+def _group_fields(fields: Mapping[str, dict]) -> Mapping[str, List[dict]]:
+    """Return the given fields table grouped by entity type.
+
+    This is not cached between reads and writes, as tinydb edits the fields table in
+    place - checking if it changed would cost as much as grouping it again.
+    """
+
+    entity_fields = collections.defaultdict(list)
+
+    for field in fields.values():
+        entity_fields[field["entity_type"]].append(field)
+
+    return entity_fields
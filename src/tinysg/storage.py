@@ -0,0 +1,142 @@
+"""Database storage."""
+
+import io
+import math
+import os
+import re
+import tinydb
+import tinydb.storages
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# orjson reads integers that do not fit in 64 bits as floats. Those are at least 19
+# digits long, so contents with a run of that many digits are read by tinydb instead.
+_LONG_DIGITS = re.compile(r"\d{19,}")
+
+
+class JSONStorage(tinydb.JSONStorage):
+    """Storage that uses orjson to (de)serialize the database, if it is installed.
+
+    The whole database is serialized on every flush, so this is the hot path for writes.
+    Without orjson, this is the same as the tinydb JSONStorage. The tinydb JSONStorage is
+    also used for contents that orjson cannot round trip: integers that do not fit in 64
+    bits, NaN, and infinity.
+    """
+
+    def __init__(self, path: str, create_dirs=False, encoding="utf-8", access_mode="r+", **kwargs):
+        """Initialize the storage.
+
+        Args:
+            path (str): Path to the database file.
+            create_dirs (bool): If True, create the parent directories of the file.
+            encoding (str): Encoding of the database file.
+            access_mode (str): Mode to open the database file in.
+        """
+
+        super().__init__(
+            path,
+            create_dirs=create_dirs,
+            encoding=encoding,
+            access_mode=access_mode,
+            **kwargs,
+        )
+
+    def read(self) -> dict:
+        """Read the database.
+
+        Returns:
+            dict: None if the database file is empty.
+        """
+
+        if orjson is None:  # pragma: no cover
+            return super().read()
+
+        self._handle.seek(0)
+
+        contents = self._handle.read()
+
+        if not contents:
+            return None
+
+        if _LONG_DIGITS.search(contents):
+            return super().read()
+
+        try:
+            return orjson.loads(contents)
+        except orjson.JSONDecodeError:
+            return super().read()
+
+    def write(self, data: dict) -> None:
+        """Write the database.
+
+        Any json.dumps keyword arguments given to the storage are only supported by the
+        tinydb JSONStorage, so it is used instead of orjson.
+
+        Args:
+            data (dict): Database contents.
+        """
+
+        if orjson is None or self.kwargs:  # pragma: no cover
+            return super().write(data)
+
+        try:
+            serialized = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            return super().write(data)
+
+        # orjson writes NaN and infinity as null, so only contents with a null can hold them.
+        if b"null" in serialized and _has_non_finite_float(data):
+            return super().write(data)
+
+        serialized = serialized.decode("utf-8")
+
+        self._handle.seek(0)
+
+        try:
+            self._handle.write(serialized)
+        except io.UnsupportedOperation:
+            raise IOError(f'Cannot write to the database. Access mode is "{self._mode}"')
+
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+        self._handle.truncate()
+
+
+class MemoryStorage(tinydb.storages.MemoryStorage):
+    """Storage that keeps the database in memory, starting from the given contents.
+
+    The contents are used as is, not copied, so they are changed by the database.
+    """
+
+    def __init__(self, data: dict = None):
+        """Initialize the storage.
+
+        Args:
+            data (dict): Database contents.
+        """
+
+        super().__init__()
+
+        self.memory = data
+
+
+def _has_non_finite_float(value) -> bool:
+    """Return True if NaN or infinity is anywhere in the given value."""
+
+    stack = [value]
+
+    while stack:
+        value = stack.pop()
+
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+
+    return False
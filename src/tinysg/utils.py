@@ -1,9 +1,15 @@
 """Package utilities."""
 
 import collections
+import contextlib
+import contextvars
 import datetime
+import frozendict
 
-from typing import Any, Dict, List, Tuple, Union
+from typing import Any, Dict, Iterator, List, Tuple, Union
+
+# Today's date for the current query, read from the clock on first use - see cache_today.
+_TODAY = contextvars.ContextVar("today", default=None)
 
 
 def as_key(entity: dict) -> Tuple[str, int]:
@@ -19,26 +25,68 @@ def as_key(entity: dict) -> Tuple[str, int]:
     return (entity["type"], entity["id"])
 
 
+@contextlib.contextmanager
+def cache_today() -> Iterator[None]:
+    """Cache today's date within the context, for today_cached.
+
+    The date is read once, the first time it is needed in the context. Nested contexts
+    share the outer context's date.
+    """
+
+    if _TODAY.get() is not None:
+        yield
+        return
+
+    token = _TODAY.set([])
+
+    try:
+        yield
+    finally:
+        _TODAY.reset(token)
+
+
 def first(items: List[Any]) -> Union[Any, None]:
     """Return the first item in the given list."""
 
     return next(iter(items), None)
 
 
-def group_by_type(entity_list: List[dict]) -> Dict[str, List[dict]]:
-    """Return the list of entities, grouped by type.
+def freeze(value: Any) -> Any:
+    """Return a hashable copy of the given value.
+
+    Dicts become frozendicts, lists become tuples, and sets become frozensets.
+
+    Args:
+        value (Any): Value to freeze.
+
+    Returns:
+        Any
+    """
+
+    if isinstance(value, dict):
+        return frozendict.frozendict((key, freeze(val)) for key, val in value.items())
+    elif isinstance(value, (list, tuple)):
+        return tuple(freeze(val) for val in value)
+    elif isinstance(value, set):
+        return frozenset(value)
+    else:
+        return value
+
+
+def index_by_type(entity_list: List[dict]) -> Dict[str, Dict[int, dict]]:
+    """Return the list of entities, grouped by type and keyed by id.
 
     Args:
         entity_list (list[dict]): List of entities to group.
 
     Returns:
-        dict[str, list[dict]]
+        dict[str, dict[int, dict]]
     """
 
-    result = collections.defaultdict(list)
+    result = collections.defaultdict(dict)
 
     for entity in entity_list:
-        result[entity["type"]].append(entity)
+        result[entity["type"]][entity["id"]] = entity
 
     return result
 
@@ -59,10 +107,35 @@ def reindex(table: Dict[str, str]) -> Dict[str, str]:
         dict
     """
 
-    return {str(i): value for i, (__, value) in enumerate(sorted(table.items()), 1)}
+    ids = [int(key) for key in table]
+
+    if all(a < b for a, b in zip(ids, ids[1:])):
+        # Tables are usually still in id order, so the sort can be skipped.
+        values = table.values()
+    else:
+        values = [table[key] for __, key in sorted(zip(ids, table))]
+
+    return dict(zip(map(str, range(1, len(ids) + 1)), values))
 
 
 def today() -> datetime.date:
     """Return today's date."""
 
     return datetime.date.today()
+
+
+def today_cached() -> datetime.date:
+    """Return today's date, cached for the current cache_today context.
+
+    Outside of a cache_today context, this is the same as today.
+    """
+
+    cache = _TODAY.get()
+
+    if cache is None:
+        return today()
+
+    if not cache:
+        cache.append(today())
+
+    return cache[0]
@@ -2,9 +2,10 @@
 
 import datetime
 import json
-import mock
+import orjson
 import os
 import pytest
+from unittest import mock
 
 import tinysg.utils
 
@@ -17,6 +18,17 @@ def test_data():
         return json.load(fp)
 
 
+@pytest.fixture(scope="session")
+def test_data_json(test_data):
+    return orjson.dumps(test_data)
+
+
+@pytest.fixture(scope="function")
+def test_data_copy(test_data_json):
+    # Decoding the serialized data is the cheapest way to get a fresh deep copy.
+    return orjson.loads(test_data_json)
+
+
 @pytest.fixture(scope="function")
 def mock_today():
     # Force coverage of the function.
@@ -13,97 +13,93 @@ from tinysg.exceptions import EntityNotFound, SchemaError
 
 
 @pytest.fixture(scope="function")
-def connection(fs, test_data):
-    tmp = fs.create_file("db", contents=json.dumps(test_data))
+def connection(test_data_copy):
+    return Connection.from_dict(test_data_copy)
 
-    return Connection(tmp.path)
 
-
-def test_create_invalid_entity_type_error(connection):
-    with pytest.raises(
-        SchemaError,
-        match="A\(n\) 'InvalidEntityType' entity has not been registered.",
-    ):
-        connection.create("InvalidEntityType", {})
-
-
-def test_create_invalid_field_error(connection):
-    with pytest.raises(
-        SchemaError,
-        match="The 'Asset' schema has no 'InvalidField' field.",
-    ):
-        connection.create("Asset", {"InvalidField": None})
+@pytest.fixture(scope="module")
+def module_connection(test_data_json):
+    # Shared by tests whose creations do not depend on each other.
+    return Connection.from_dict(json.loads(test_data_json))
 
 
-def test_create_invalidate_field_value_error(connection):
-    with pytest.raises(
-        ValueError,
-        match="Enum field 'Asset.asset_type' expects 'Character, Prop, Set', got 'Villain'.",
-    ):
-        connection.create(
+@pytest.mark.parametrize(
+    "entity_type,data,error,error_msg",
+    (
+        (
+            "InvalidEntityType",
+            {},
+            SchemaError,
+            "A\(n\) 'InvalidEntityType' entity has not been registered.",
+        ),
+        (
+            "Asset",
+            {"InvalidField": None},
+            SchemaError,
+            "The 'Asset' schema has no 'InvalidField' field.",
+        ),
+        (
             "Asset",
             {
                 "code": "The Hero of our Story",
                 "asset_type": "Villain",
             },
-        )
-
-
-def test_create_invalidate_entity_field_type_error(connection):
-    with pytest.raises(
-        ValueError,
-        match="Field 'Asset.project' expects a 'Project' entity, got 'Sequence'.",
-    ):
-        connection.create(
+            ValueError,
+            "Enum field 'Asset.asset_type' expects 'Character, Prop, Set', got 'Villain'.",
+        ),
+        (
             "Asset",
             {
                 "code": "The Hero of our Story",
                 "asset_type": "Character",
                 "project": {"type": "Sequence", "id": 1},
             },
-        )
-
-
-def test_create_invalidate_entity_field_value_error(connection):
-    with pytest.raises(
-        EntityNotFound,
-        match="Cannot link 'Project' to 'Asset.project' because they do not exist: 99",
-    ):
-        connection.create(
+            ValueError,
+            "Field 'Asset.project' expects a 'Project' entity, got 'Sequence'.",
+        ),
+        (
             "Asset",
             {
                 "code": "The Hero of our Story",
                 "asset_type": "Character",
                 "project": {"code": "test", "id": 99, "type": "Project"},
             },
-        )
-
-    with pytest.raises(
-        EntityNotFound,
-        match="Cannot link 'Shot' to 'Sequence.shots' because they do not exist: 42",
-    ):
-        connection.create(
+            EntityNotFound,
+            "Cannot link 'Project' to 'Asset.project' because they do not exist: 99",
+        ),
+        (
             "Sequence",
             {
                 "shots": [
                     {"type": "Shot", "id": 42},
                 ],
             },
-        )
-
-
-def test_create_missing_required_field_error(connection):
-    with pytest.raises(
-        ValueError,
-        match="Must set required fields for 'Asset' entity: asset_type, project",
-    ):
-        connection.create(
+            EntityNotFound,
+            "Cannot link 'Shot' to 'Sequence.shots' because they do not exist: 42",
+        ),
+        (
             "Asset",
             {
                 "code": "the_hero",
                 "name": "The Hero",
             },
-        )
+            ValueError,
+            "Must set required fields for 'Asset' entity: asset_type, project",
+        ),
+    ),
+    ids=[
+        "invalid entity type",
+        "invalid field",
+        "invalid field value",
+        "invalid entity field type",
+        "invalid entity field value",
+        "invalid multi-entity field value",
+        "missing required field",
+    ],
+)
+def test_create_error(connection, entity_type, data, error, error_msg):
+    with pytest.raises(error, match=error_msg):
+        connection.create(entity_type, data)
 
 
 def test_create_non_unique_entity_error(connection):
@@ -123,6 +119,28 @@ def test_create_non_unique_entity_error(connection):
         connection.create("Asset", data)
 
 
+def test_create_keeps_other_identifier_indexes(connection):
+    connection.create("Project", {"code": "other", "name": "Other"})
+
+    connection.create(
+        "Asset",
+        {
+            "asset_type": "Character",
+            "name": "The Hero",
+            "code": "the_hero",
+            "project": {"type": "Project", "id": 1},
+        },
+    )
+
+    assert "Project" in connection._identifier_index
+
+    with pytest.raises(
+        ValueError,
+        match="Cannot create 'Project' entity because its identifier field values are not unique: code",
+    ):
+        connection.create("Project", {"code": "other", "name": "Other"})
+
+
 def test_create_non_unique_entity(connection):
     data = {
         "name": "test",
@@ -183,8 +201,8 @@ def test_create(connection):
         "Asset",
     ],
 )
-def test_create_polymorphic_entity_field_value(connection, link):
-    result = connection.create(
+def test_create_polymorphic_entity_field_value(module_connection, link):
+    result = module_connection.create(
         "Task",
         {
             "name": "lookdev",
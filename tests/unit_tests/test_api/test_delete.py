@@ -1,6 +1,5 @@
 """Test suite for the delete method."""
 
-import json
 import pytest
 
 import tinysg.entity
@@ -10,10 +9,8 @@ from tinysg.exceptions import EntityNotFound, SchemaError
 
 
 @pytest.fixture(scope="function")
-def connection(fs, test_data):
-    tmp = fs.create_file("db", contents=json.dumps(test_data))
-
-    return Connection(tmp.path)
+def connection(test_data_copy):
+    return Connection.from_dict(test_data_copy)
 
 
 def test_delete_invalid_entity_type_error(connection):
@@ -60,3 +57,38 @@ def test_delete(connection):
 
     for shot in shots:
         assert handle not in shot["assets"]
+
+
+def test_delete_first_entity(connection):
+    connection.delete("Asset", 1)
+
+    entity = connection.find_one("Asset", [], ["code"])
+
+    assert entity is not None, "Deleted entity should not hide the other entities."
+    assert entity["id"] == 2
+
+
+def test_delete_find_after_delete(connection):
+    filters = [["number", "is", "0010"]]
+
+    shots = connection.find_all("Shot", filters)
+    assert len(shots) == 2
+
+    connection.delete("Shot", 1)
+
+    shots = connection.find_all("Shot", filters)
+    assert len(shots) == 1, "Deleted entity should not be found by a repeated query."
+
+
+def test_delete_create_after_delete(connection):
+    data = {
+        "asset_type": "Character",
+        "name": "The Hero",
+        "code": "the_hero",
+        "project": {"id": 1, "type": "Project"},
+    }
+
+    entity = connection.create("Asset", data)
+    connection.delete("Asset", entity["id"])
+
+    assert connection.create("Asset", data)["id"] != entity["id"]
@@ -7,11 +7,10 @@ from tinysg import Connection
 from tinysg.exceptions import FilterSpecError, SchemaError
 
 
-@pytest.fixture(scope="function")
-def connection(fs, test_data):
-    tmp = fs.create_file("db", contents=json.dumps(test_data))
-
-    return Connection(tmp.path)
+@pytest.fixture(scope="module")
+def connection(test_data_json):
+    # The find tests never write, so they share one connection.
+    return Connection.from_dict(json.loads(test_data_json))
 
 
 def test_find_invalid_entity_type(connection):
@@ -40,7 +39,7 @@ def test_find_one(connection):
     )
 
     assert result is not None
-    assert set(result.keys()) == {"type", "id", "asset_type"}
+    assert result.keys() == {"type", "id", "asset_type"}
 
     _check_entity(result, {"asset_type": "Character", "id": 1})
 
@@ -57,7 +56,7 @@ def test_find_one_by_id(connection):
     )
 
     assert result is not None
-    assert set(result.keys()) == {"type", "id", "asset_type"}
+    assert result.keys() == {"type", "id", "asset_type"}
 
     _check_entity(result, {"asset_type": "Character", "id": 1})
 
@@ -72,6 +71,14 @@ def test_find_one_no_result(connection):
 
     assert result is None
 
+    assert connection.find_one("Asset", [["id", "is", 99]]) is None
+
+
+def test_find_one_no_filters(connection):
+    result = connection.find_one("Asset", [])
+
+    assert result == connection.find_all("Asset", [])[0]
+
 
 def test_find_all_no_filters(connection):
     results = connection.find_all("Asset", [])
@@ -115,6 +122,38 @@ def test_find_all(connection):
     _check_entity(results[1], {"asset_type": "Character", "id": 2, "project": project})
 
 
+def test_find_all_indexed_and_scanned_filters(connection):
+    result = connection.find_all(
+        "Asset",
+        [
+            ["code", "contains", "o"],
+            ["asset_type", "in", ["Character", "Prop"]],
+            ["id", "is_not", 1],
+        ],
+        ["code"],
+    )
+
+    assert result == [{"type": "Asset", "id": 3, "code": "prop.sword"}]
+
+
+def test_find_all_set_filter_value(connection):
+    result = connection.find_all("Asset", [["code", "in", {"prop.sword"}]], ["code"])
+
+    assert result == [{"type": "Asset", "id": 3, "code": "prop.sword"}]
+
+    result = connection.find_all(
+        "Asset",
+        [["code", "contains", "o"], ["asset_type", "in", {"Prop"}]],
+        ["code"],
+    )
+
+    assert result == [{"type": "Asset", "id": 3, "code": "prop.sword"}]
+
+    result = connection.find_one("Asset", [["code", "in", {"prop.sword"}]], ["code"])
+
+    assert result == {"type": "Asset", "id": 3, "code": "prop.sword"}
+
+
 def test_find_all_link_entity_field(connection):
     results = connection.find_all(
         "Shot",
@@ -204,9 +243,7 @@ def test_find_all_link_multi_entity_field_no_results(connection):
 
 
 def _check_entity(actual, expected):
-    for field, expected_value in expected.items():
-        assert field in actual, f"Field {field} not in result."
-        assert actual[field] == expected_value, f"Field '{field}' does not have the expected value"
+    assert actual.items() >= expected.items(), "Result does not have the expected values."
 
 
 def test_find_by_entity(connection):
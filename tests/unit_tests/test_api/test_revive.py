@@ -1,6 +1,5 @@
 """Test suite for the revive method."""
 
-import json
 import pytest
 
 import tinysg.entity
@@ -10,26 +9,31 @@ from tinysg.exceptions import EntityNotFound, SchemaError
 
 
 @pytest.fixture(scope="function")
-def connection(fs, test_data):
-    tmp = fs.create_file("db", contents=json.dumps(test_data))
-
-    return Connection(tmp.path)
-
-
-def test_revive_invalid_entity_type_error(connection):
-    with pytest.raises(
-        SchemaError,
-        match="A\(n\) 'InvalidEntityType' entity has not been registered.",
-    ):
-        connection.revive("InvalidEntityType", 1)
-
-
-def test_revive_invalid_entity_id_error(connection):
-    with pytest.raises(
-        EntityNotFound,
-        match="A\(n\) 'Asset' entity for id -1 does not exist.",
-    ):
-        connection.revive("Asset", -1)
+def connection(test_data_copy):
+    return Connection.from_dict(test_data_copy)
+
+
+@pytest.mark.parametrize(
+    "entity_type,entity_id,error,error_msg",
+    (
+        (
+            "InvalidEntityType",
+            1,
+            SchemaError,
+            "A\(n\) 'InvalidEntityType' entity has not been registered.",
+        ),
+        (
+            "Asset",
+            -1,
+            EntityNotFound,
+            "A\(n\) 'Asset' entity for id -1 does not exist.",
+        ),
+    ),
+    ids=["invalid entity type", "invalid entity id"],
+)
+def test_revive_error(connection, entity_type, entity_id, error, error_msg):
+    with pytest.raises(error, match=error_msg):
+        connection.revive(entity_type, entity_id)
 
 
 def test_revive(connection):
@@ -52,14 +56,10 @@ def test_revive(connection):
 
     shots = connection.find_all("Shot", [["id", "in", [1, 3]]], ["assets"])
 
-    handle = {
-        "type": asset["type"],
-        "id": asset["id"],
-        "name": asset["code"],
-    }
+    handle = (asset["type"], asset["id"], asset["code"])
 
     for shot in shots:
-        assert handle in shot["assets"]
+        assert handle in {(each["type"], each["id"], each["name"]) for each in shot["assets"]}
 
 
 def test_revive_with_an_obsolete_link_1(connection):
@@ -1,54 +1,58 @@
 """Test suite for the update methods."""
 
-import json
 import pytest
 import re
 
 from tinysg import Connection
 from tinysg.exceptions import EntityNotFound, SchemaError
 
+SHOT_1 = {"type": "Shot", "id": 1, "name": "0100.0010"}
+SHOT_2 = {"type": "Shot", "id": 2, "name": "0100.0020"}
+SHOT_3 = {"type": "Shot", "id": 3, "name": "0200.0010"}
 
-@pytest.fixture(scope="function")
-def connection(fs, test_data):
-    tmp = fs.create_file("db", contents=json.dumps(test_data))
-
-    return Connection(tmp.path)
-
-
-def test_update_invalid_entity_type_error(connection):
-    with pytest.raises(
-        SchemaError,
-        match="A\(n\) 'InvalidEntityType' entity has not been registered.",
-    ):
-        connection.update("InvalidEntityType", -1, {})
-
-
-def test_update_invalid_entity_id_error(connection):
-    with pytest.raises(
-        EntityNotFound,
-        match="A\(n\) 'Asset' entity for id -1 does not exist.",
-    ):
-        connection.update("Asset", -1, {})
-
-
-def test_update_invalid_field_error(connection):
-    with pytest.raises(
-        SchemaError,
-        match="The 'Asset' schema has no 'InvalidField' field.",
-    ):
-        connection.update("Asset", 1, {"InvalidField": None})
 
+@pytest.fixture(scope="function")
+def connection(test_data_copy):
+    return Connection.from_dict(test_data_copy)
 
-def test_update_invalid_field_value_error(connection):
-    data = {
-        "asset_type": "Villain",
-    }
 
-    with pytest.raises(
-        ValueError,
-        match="Enum field 'Asset.asset_type' expects 'Character, Prop, Set', got 'Villain'.",
-    ):
-        connection.update("Asset", 1, data)
+@pytest.mark.parametrize(
+    "entity_type,entity_id,data,error,error_msg",
+    (
+        (
+            "InvalidEntityType",
+            -1,
+            {},
+            SchemaError,
+            "A\(n\) 'InvalidEntityType' entity has not been registered.",
+        ),
+        (
+            "Asset",
+            -1,
+            {},
+            EntityNotFound,
+            "A\(n\) 'Asset' entity for id -1 does not exist.",
+        ),
+        (
+            "Asset",
+            1,
+            {"InvalidField": None},
+            SchemaError,
+            "The 'Asset' schema has no 'InvalidField' field.",
+        ),
+        (
+            "Asset",
+            1,
+            {"asset_type": "Villain"},
+            ValueError,
+            "Enum field 'Asset.asset_type' expects 'Character, Prop, Set', got 'Villain'.",
+        ),
+    ),
+    ids=["invalid entity type", "invalid entity id", "invalid field", "invalid field value"],
+)
+def test_update_error(connection, entity_type, entity_id, data, error, error_msg):
+    with pytest.raises(error, match=error_msg):
+        connection.update(entity_type, entity_id, data)
 
 
 @pytest.mark.parametrize(
@@ -70,20 +74,23 @@ def test_update_invalid_entity_field_value_error(connection, data, error_msg):
         connection.update("Sequence", 1, data)
 
 
-def test_update_invalid_multi_entity_update_mode_error(connection):
-    with pytest.raises(
-        ValueError,
-        match="Invalid update mode 'update' for multi-entity field 'Sequence.shots' - expected add, remove, set.",
-    ):
-        connection.update("Sequence", 1, {}, {"shots": "update"})
-
-
-def test_update_invalid_field_multi_entity_update_mode_error(connection):
-    with pytest.raises(
-        ValueError,
-        match="'Sequence.project' is not a multi-entity field.",
-    ):
-        connection.update("Sequence", 1, {}, {"project": "add"})
+@pytest.mark.parametrize(
+    "update_modes,error_msg",
+    (
+        (
+            {"shots": "update"},
+            "Invalid update mode 'update' for multi-entity field 'Sequence.shots' - expected add, remove, set.",
+        ),
+        (
+            {"project": "add"},
+            "'Sequence.project' is not a multi-entity field.",
+        ),
+    ),
+    ids=["invalid update mode", "not a multi-entity field"],
+)
+def test_update_multi_entity_update_mode_error(connection, update_modes, error_msg):
+    with pytest.raises(ValueError, match=error_msg):
+        connection.update("Sequence", 1, {}, update_modes)
 
 
 def test_update(connection):
@@ -147,130 +154,139 @@ def test_update_required_field_error(connection):
 
 
 def test_update_identifier_field_error(connection):
-    project = {"code": "test", "id": 1, "type": "Project"}
-
-    a = connection.create(
+    hero = connection.find_one("Asset", [["id", "is", 1]], ["asset_type", "project"])
+    villain = connection.find_one(
         "Asset",
-        {
-            "asset_type": "Character",
-            "code": "the_hero",
-            "name": "The Hero",
-            "project": project,
-        },
+        [
+            ["asset_type", "is", hero["asset_type"]],
+            ["code", "is", "character.the_villain"],
+            ["name", "is", "the_villain"],
+            ["project", "is", hero["project"]],
+        ],
     )
 
-    connection.create(
-        "Asset",
-        {
-            "asset_type": "Character",
-            "code": "the_villain",
-            "name": "The Villain",
-            "project": project,
-        },
-    )
+    assert villain is not None, "The test data should have a villain in the hero's project."
+    assert villain["id"] != hero["id"]
 
     with pytest.raises(
         ValueError,
         match=re.escape(
-            f"Cannot update 'Asset' ({a['id']}) because its new identifier field values are not unqiue: code, name"
+            "Cannot update 'Asset' (1) because its new identifier field values are not unqiue: code, name"
         ),
     ):
         connection.update(
-            a["type"],
-            a["id"],
+            "Asset",
+            1,
             {
-                "name": "The Villain",
-                "code": "the_villain",
+                "name": "the_villain",
+                "code": "character.the_villain",
             },
         )
 
 
-def test_update_multi_entity_field(connection):
-    result = connection.create(
+def test_update_identifier_field(connection):
+    data = {
+        "asset_type": "Character",
+        "code": "the_hero",
+        "name": "The Hero",
+        "project": {"code": "test", "id": 1, "type": "Project"},
+    }
+
+    a = connection.create("Asset", data)
+
+    connection.update(a["type"], a["id"], {"code": "the_villain"})
+
+    # The old identifier is free again, and the new one is taken.
+    assert connection.create("Asset", data) is not None
+
+    with pytest.raises(ValueError, match="identifier field values are not unique"):
+        connection.create("Asset", dict(data, code="the_villain"))
+
+
+def test_update_indexed_field(connection):
+    assert connection.find_all("Asset", [["asset_type", "is", "Set"]], ["code"]) == []
+
+    connection.update("Asset", 1, {"asset_type": "Set"})
+
+    result = connection.find_all("Asset", [["asset_type", "in", ["Set"]]], ["code"])
+
+    assert result == [{"type": "Asset", "id": 1, "code": "character.our_hero"}]
+
+
+@pytest.fixture(scope="function")
+def asset(connection):
+    return connection.create(
         "Asset",
         {
             "asset_type": "Character",
             "code": "the_hero",
             "name": "The Hero",
             "project": {"code": "test", "id": 1, "type": "Project"},
+            "shots": [{"type": "Shot", "id": 1}, {"type": "Shot", "id": 2}],
         },
     )
 
-    entity_type = result["type"]
-    entity_id = result["id"]
-
-    _set_shots(connection, entity_type, entity_id)
-    _add_shots(connection, entity_type, entity_id)
-    _remove_shots(connection, entity_type, entity_id)
-    _clear_shots(connection, entity_type, entity_id)
 
-
-def _set_shots(connection, entity_type, entity_id):
+@pytest.mark.parametrize(
+    "update_mode,shots,expected",
+    (
+        ("set", [SHOT_1], [SHOT_1]),
+        ("add", [SHOT_3], [SHOT_1, SHOT_2, SHOT_3]),
+        ("remove", [SHOT_1], [SHOT_2]),
+        ("set", [], None),
+    ),
+    ids=["set", "add", "remove", "clear"],
+)
+def test_update_multi_entity_field(connection, asset, update_mode, shots, expected):
     result = connection.update(
-        entity_type,
-        entity_id,
-        {
-            "shots": [{"type": "Shot", "id": 1}],
-        },
-        multi_entity_update_modes={
-            "shots": "set",
-        },
+        asset["type"],
+        asset["id"],
+        {"shots": [{"type": shot["type"], "id": shot["id"]} for shot in shots]},
+        multi_entity_update_modes={"shots": update_mode},
     )
 
     assert result is not None
-    assert result["shots"] == [
-        {"type": "Shot", "id": 1, "name": "0100.0010"},
-    ]
+    assert result.get("shots") == expected
 
 
-def _add_shots(connection, entity_type, entity_id):
-    result = connection.update(
-        entity_type,
-        entity_id,
-        {
-            "shots": [{"type": "Shot", "id": 2}],
-        },
-        multi_entity_update_modes={
-            "shots": "add",
-        },
+def test_update_many(connection):
+    result = connection.update_many(
+        "Asset",
+        1,
+        [
+            ({"shots": [{"type": "Shot", "id": 1}]}, {"shots": "set"}),
+            ({"shots": [{"type": "Shot", "id": 2}]}, {"shots": "add"}),
+            ({"shots": [{"type": "Shot", "id": 1}], "name": "Hero"}, {"shots": "remove"}),
+        ],
     )
 
-    assert result is not None
-    assert result["shots"] == [
-        {"type": "Shot", "id": 1, "name": "0100.0010"},
-        {"type": "Shot", "id": 2, "name": "0100.0020"},
-    ]
-
+    assert result == {
+        "type": "Asset",
+        "id": 1,
+        "name": "Hero",
+        "shots": [{"type": "Shot", "id": 2, "name": "0100.0020"}],
+    }
 
-def _remove_shots(connection, entity_type, entity_id):
-    result = connection.update(
-        entity_type,
-        entity_id,
-        {
-            "shots": [{"type": "Shot", "id": 1}],
-        },
-        multi_entity_update_modes={
-            "shots": "remove",
-        },
-    )
+    assert connection.update_many("Asset", 1, []) == {"type": "Asset", "id": 1}
+    assert connection.update_many("Asset", 1, None) == {"type": "Asset", "id": 1}
 
-    assert result is not None
-    assert result["shots"] == [
-        {"type": "Shot", "id": 2, "name": "0100.0020"},
-    ]
+    with pytest.raises(
+        EntityNotFound,
+        match="A\(n\) 'Asset' entity for id -1 does not exist.",
+    ):
+        connection.update_many("Asset", -1, [])
 
 
-def _clear_shots(connection, entity_type, entity_id):
-    result = connection.update(
-        entity_type,
-        entity_id,
-        {
-            "shots": [],
-        },
-        multi_entity_update_modes={
-            "shots": "set",
-        },
+def test_update_many_reverse_links(connection):
+    connection.update_many(
+        "Asset",
+        1,
+        [
+            ({"children": [{"type": "Asset", "id": 2}]}, {"children": "add"}),
+            ({"children": [{"type": "Asset", "id": 3}]}, {"children": "remove"}),
+        ],
     )
 
-    assert result is not None
-    assert "shots" not in result
+    result = connection.find_all("Asset", [["parent", "is", {"type": "Asset", "id": 1}]])
+
+    assert [each["id"] for each in result] == [2]
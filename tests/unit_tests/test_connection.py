@@ -1,9 +1,13 @@
 """Test for the Connection object."""
 
 import json
+import math
 import pytest
 
+from unittest import mock
+
 from tinysg import Connection
+from tinysg.storage import JSONStorage
 
 
 def test_connection_init_file_not_found_error():
@@ -14,7 +18,105 @@ def test_connection_init_file_not_found_error():
         Connection("/path/to/nothing")
 
 
-def test_connection_init(fs, test_data):
-    tmp = fs.create_file("json", contents=json.dumps(test_data))
+def test_connection_init(tmp_path, test_data_json):
+    tmp = tmp_path / "json"
+    tmp.write_bytes(test_data_json)
+
+    Connection(str(tmp))
+
+
+def test_connection_from_dict(test_data):
+    data = json.loads(json.dumps(test_data))
+
+    connection = Connection.from_dict(data)
+    connection.update("Asset", 1, {"status": "Omit"})
+
+    assert connection.find_one("Asset", [["status", "is", "Omit"]]) is not None
+    assert data["Asset"]["1"]["status"] == "Omit"
+
+
+def test_connection_transaction(tmp_path, test_data_json):
+    tmp = tmp_path / "json"
+    tmp.write_bytes(test_data_json)
+
+    connection = Connection(str(tmp))
+
+    def _read_status():
+        with open(tmp, "r") as fp:
+            return json.load(fp)["Asset"]["1"].get("status")
+
+    with connection.transaction():
+        with connection.transaction():
+            connection.update("Asset", 1, {"status": "Omit"})
+
+        assert _read_status() is None
+        assert connection.find_one("Asset", [["status", "is", "Omit"]]) is not None
+
+    assert _read_status() == "Omit"
+
+
+def test_connection_transaction_reverse_links(tmp_path, test_data_json):
+    tmp = tmp_path / "json"
+    tmp.write_bytes(test_data_json)
+
+    connection = Connection(str(tmp))
+
+    asset_1 = {"type": "Asset", "id": 1}
+    asset_2 = {"type": "Asset", "id": 2}
+    asset_3 = {"type": "Asset", "id": 3}
+
+    with mock.patch.object(
+        JSONStorage, "write", autospec=True, side_effect=JSONStorage.write
+    ) as mock_write:
+        with connection.transaction():
+            connection.update("Asset", 1, {"children": [asset_2]}, {"children": "add"})
+
+            result = connection.find_all("Asset", [["parent", "is", asset_1]])
+            assert {each["id"] for each in result} == {2, 3}
+
+            with connection.transaction():
+                connection.update("Asset", 2, {"parent": asset_3})
+
+                asset_4 = connection.create(
+                    "Asset",
+                    {
+                        "asset_type": "Prop",
+                        "name": "shield",
+                        "code": "prop.shield",
+                        "project": {"type": "Project", "id": 1},
+                        "parent": asset_2,
+                    },
+                )
+
+            result = connection.find_all("Asset", [["parent", "is", asset_2]])
+            assert [each["id"] for each in result] == [asset_4["id"]]
+
+            assert mock_write.call_count == 0
+
+    assert mock_write.call_count == 1
+
+    connection = Connection(str(tmp))
+
+    asset = connection.find_one("Asset", [["id", "is", 1]], ["children"])
+    assert [each["id"] for each in asset["children"]] == [3]
+
+    asset = connection.find_one("Asset", [["id", "is", 2]], ["parent", "children"])
+    assert asset["parent"]["id"] == 3
+    assert [each["id"] for each in asset["children"]] == [asset_4["id"]]
+
+    asset = connection.find_one("Asset", [["id", "is", 3]], ["children"])
+    assert [each["id"] for each in asset["children"]] == [2]
+
+
+def test_connection_json_field_non_orjson_values(tmp_path, test_data_json):
+    tmp = tmp_path / "json"
+    tmp.write_bytes(test_data_json)
+
+    connection = Connection(str(tmp))
+    connection.schema_field_create("Asset", "data", {"type": "json"})
+    connection.update("Asset", 1, {"data": {"large": 2**70, "nan": float("nan")}})
+
+    result = Connection(str(tmp)).find_one("Asset", [["id", "is", 1]], ["data"])
 
-    Connection(tmp.path)
+    assert result["data"]["large"] == 2**70
+    assert math.isnan(result["data"]["nan"])
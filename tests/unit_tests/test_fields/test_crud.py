@@ -9,17 +9,22 @@ from tinysg.exceptions import SchemaError
 
 
 @pytest.fixture(scope="function")
-def connection(fs, test_data):
-    tmp = fs.create_file("db", contents=json.dumps(test_data))
-
-    return Connection(tmp.path)
+def connection(test_data_copy):
+    return Connection.from_dict(test_data_copy)
 
 
 @pytest.fixture(scope="function")
-def new_connection(fs):
-    tmp = fs.create_file("db", contents="{}")
+def new_connection():
+    return Connection.from_dict({})
+
+
+@pytest.fixture(scope="module")
+def note_connection(test_data_json):
+    # Each test_add_field case adds a different field, so they share one entity type.
+    connection = Connection.from_dict(json.loads(test_data_json))
+    connection.schema_entity_create("Note")
 
-    return Connection(tmp.path)
+    return connection
 
 
 def test_schema_field_create_error(connection):
@@ -98,16 +103,17 @@ def test_schema_field_create_error(connection):
         "text",
     ],
 )
-def test_add_field(connection, field_name, properties):
+def test_add_field(note_connection, field_name, properties):
     entity_type = "Note"
 
-    connection.schema_entity_create(entity_type)
+    connection = note_connection
     assert not connection.schema_field_check(entity_type, field_name)
 
-    connection.schema_field_create(entity_type, field_name, properties)
+    created = connection.schema_field_create(entity_type, field_name, properties)
     result = connection.schema_field_read(entity_type, field_name)
 
     assert result is not None
+    assert result == created
     assert result["entity_type"] == entity_type
     assert result["name"] == field_name
 
@@ -165,6 +171,9 @@ def test_update_field(new_connection):
     field = connection.schema_field_update(entity_type, field_name, {"default": "wip"})
     assert field["default"] == "wip"
     assert field["values"] == status_list
+    assert connection.schema_field_read(entity_type, field_name) == field
+
+    assert connection.schema_field_update(entity_type, field_name, {"default": "wip"}) == field
 
 
 def test_update_field_error(new_connection):
@@ -180,3 +189,34 @@ def test_update_field_error(new_connection):
         match="Default value for a 'date' field must be True/False",
     ):
         connection.schema_field_update(entity_type, field_name, {"default": "this_week"})
+
+
+def test_schema_field_cache(new_connection):
+    entity_type = "Task"
+    field_name = "name"
+
+    connection = new_connection
+    connection.schema_entity_create(entity_type)
+
+    fields = [field["name"] for field in connection.schema_field_read_all(entity_type)]
+    assert field_name not in fields
+
+    connection.schema_field_create(entity_type, field_name, {"type": "text"})
+
+    fields = [field["name"] for field in connection.schema_field_read_all(entity_type)]
+    assert field_name in fields
+
+    connection.schema_field_delete(entity_type, field_name)
+
+    fields = [field["name"] for field in connection.schema_field_read_all(entity_type)]
+    assert field_name not in fields
+
+
+def test_read_many_fields(connection):
+    results = connection.schema_field_read_many("Asset", ["id", "name"])
+
+    assert list(results) == ["id", "name"]
+    assert results["name"] == connection.schema_field_read("Asset", "name")
+
+    with pytest.raises(SchemaError, match="Entity 'Asset' has no 'banana' field."):
+        connection.schema_field_read_many("Asset", ["name", "banana"])
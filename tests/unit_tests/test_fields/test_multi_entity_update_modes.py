@@ -2,8 +2,8 @@
 
 import datetime
 import json
-import mock
 import pytest
+from unittest import mock
 
 import tinysg.fields
 import tinysg.utils
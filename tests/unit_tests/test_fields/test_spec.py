@@ -46,6 +46,7 @@ def test_valid_field_spec(properties):
     [
         {},
         {"type": "banana"},
+        {"type": "num"},
         {"type": FieldType.BOOL.value, "default": "yes"},
         {"type": FieldType.DATE.value, "default": "today"},
         {"type": FieldType.DATE_TIME.value, "default": "now"},
@@ -72,6 +73,7 @@ def test_valid_field_spec(properties):
     ids=[
         "any: no properties",
         "invalid data type",
+        "invalid data type (partial name)",
         "bool: invalid default",
         "date: invalid default",
         "datetime: invalid default",
@@ -93,8 +95,12 @@ def test_invalid_field_spec(properties):
         tinysg.fields.validate_spec(properties)
 
 
-def test_conform_field_spec():
-    field_spec = {"type": FieldType.ENTITY.value, "link": "Shot"}
+@pytest.mark.parametrize(
+    "field_type",
+    [FieldType.ENTITY.value, FieldType.MULTI_ENTITY.value],
+)
+def test_conform_field_spec(field_type):
+    field_spec = {"type": field_type, "link": "Shot"}
 
     tinysg.fields.conform_spec(field_spec)
 
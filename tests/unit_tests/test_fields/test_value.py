@@ -2,8 +2,8 @@
 
 import datetime
 import json
-import mock
 import pytest
+from unittest import mock
 
 import tinysg.fields
 import tinysg.utils
@@ -80,11 +80,19 @@ def test_valid_field_value(value, expected, field_spec):
     "value,expected,field_spec",
     [
         (TODAY, "2000-09-01", {"type": FieldType.DATE.value, "default": False}),
+        (NOW, "2000-09-01", {"type": FieldType.DATE.value, "default": False}),
+        (
+            datetime.date(999, 1, 2),
+            "0999-01-02",
+            {"type": FieldType.DATE.value, "default": False},
+        ),
         (None, "2000-09-02", {"type": FieldType.DATE.value, "default": True}),
         (None, None, {"type": FieldType.DATE.value}),
     ],
     ids=[
         "date",
+        "date (from datetime)",
+        "date (year below 1000)",
         "date (default)",
         "date (no default)",
     ],
@@ -97,11 +105,17 @@ def test_valid_date_field_value(value, expected, field_spec, mock_today):
     "value,expected,field_spec",
     [
         (NOW, "2000-09-01 07:30:01", {"type": FieldType.DATE_TIME.value, "default": True}),
+        (
+            datetime.datetime(5, 1, 2, 3, 4, 5),
+            "0005-01-02 03:04:05",
+            {"type": FieldType.DATE_TIME.value, "default": True},
+        ),
         (None, "2000-09-02 12:24:36", {"type": FieldType.DATE_TIME.value, "default": True}),
         (None, None, {"type": FieldType.DATE_TIME.value}),
     ],
     ids=[
         "datetime",
+        "datetime (year below 1000)",
         "datetime (default)",
         "datetime (no default)",
     ],
@@ -134,6 +148,7 @@ def _check_field_value(value, expected, field_spec):
         ("x", {"type": FieldType.ENUM.value, "values": ["a", "b", "c"]}),
         ("red", {"type": FieldType.FLOAT.value}),
         (tinysg.utils.now(), {"type": FieldType.JSON.value}),
+        ({"foo": [{"bar": {1, 2}}]}, {"type": FieldType.JSON.value}),
         ([1], {"type": FieldType.MULTI_ENTITY.value, "link": "Shot"}),
         ([{}], {"type": FieldType.MULTI_ENTITY.value, "link": "Shot"}),
         ([{"type": "Asset", "id": 1}], {"type": FieldType.MULTI_ENTITY.value, "link": "Shot"}),
@@ -154,6 +169,7 @@ def _check_field_value(value, expected, field_spec):
         "enum: invalid value",
         "float: invalid value",
         "json: invalid value",
+        "json: invalid nested value",
         "multi_entity: invalid values",
         "multi_entity: incomplete values",
         "multi_entity: invalid entity type",
@@ -4,6 +4,7 @@ import datetime
 import pytest
 
 import tinysg.fields
+import tinysg.filters
 import tinysg.utils
 
 from tinysg import Connection
@@ -12,11 +13,10 @@ from tinysg.exceptions import FilterSpecError
 TODAY = datetime.date
 
 
-@pytest.fixture(scope="function")
-def connection(fs, test_data):
-    tmp = fs.create_file("db", contents="{}")
-
-    return Connection(tmp.path)
+@pytest.fixture(scope="module")
+def connection():
+    # Building queries never writes, so the tests share one connection.
+    return Connection.from_dict({})
 
 
 @pytest.mark.parametrize(
@@ -38,7 +38,7 @@ def test_get_invalid_filter(connection, filter_spec, error_msg):
         FilterSpecError,
         match=error_msg,
     ):
-        connection._filter_to_query(filter_spec)
+        connection._filters_to_query([filter_spec])
 
 
 def test_parse_deep_field_invalid_spec_error():
@@ -49,15 +49,24 @@ def test_parse_deep_field_invalid_spec_error():
         tinysg.fields.parse_deep_field("field.Entity")
 
 
+def test_compile():
+    test = tinysg.filters.compile([["a", "greater_than", 1], ["b", "starts_with", "f"]])
+
+    assert test({"a": 2, "b": "fizz"})
+    assert not test({"a": 1, "b": "fizz"})
+    assert not test({"a": 2, "b": "buzz"})
+    assert not test({"a": 2})
+
+
 def test_between(connection):
-    query = connection._filter_to_query(["field", "between", 1, 10])
+    query = connection._filters_to_query([["field", "between", 1, 10]])
 
     assert query({"field": 5})
     assert not query({"field": 15})
 
 
 def test_contains(connection):
-    query = connection._filter_to_query(["field", "contains", "a"])
+    query = connection._filters_to_query([["field", "contains", "a"]])
 
     assert query({"field": "cat"})
     assert not query({"field": "dog"})
@@ -67,34 +76,50 @@ def test_contains(connection):
 
 
 def test_ends_with(connection):
-    query = connection._filter_to_query(["field", "ends_with", "z"])
+    query = connection._filters_to_query([["field", "ends_with", "z"]])
 
     assert query({"field": "fizz"})
     assert not query({"field": "fuss"})
 
 
 def test_greater_than(connection):
-    query = connection._filter_to_query(["field", "greater_than", 5])
+    query = connection._filters_to_query([["field", "greater_than", 5]])
 
     assert query({"field": 10})
     assert not query({"field": 1})
 
 
 def test_less_than(connection):
-    query = connection._filter_to_query(["field", "less_than", 5])
+    query = connection._filters_to_query([["field", "less_than", 5]])
 
     assert query({"field": 1})
     assert not query({"field": 10})
 
 
 def test_in(connection):
-    query = connection._filter_to_query(["field", "in", ["value"]])
+    query = connection._filters_to_query([["field", "in", ["value"]]])
 
     assert query({"field": "value"})
     assert not query({"field", "foobar"})
     assert not query({})
 
 
+def test_in_list_value(connection):
+    query = connection._filters_to_query([["field", "in", [1, 2, 3]]])
+
+    assert query({"field": [3, 4]})
+    assert query({"field": [{"id": 1}, 2]})
+    assert not query({"field": [4, 5]})
+    assert not query({"field": {"id": 1}})
+
+    query = connection._filters_to_query([["field", "in", [{"type": "Asset", "id": 1}]]])
+
+    assert query({"field": {"type": "Asset", "id": 1}})
+    assert query({"field": [{"type": "Asset", "id": 1, "code": "hero"}]})
+    assert not query({"field": {"type": "Asset", "id": 2}})
+    assert not query({"field": [{"type": "Shot", "id": 1}, {"id": 1}, 1]})
+
+
 @pytest.mark.parametrize(
     "filter_value,pos_value,neg_value",
     (
@@ -128,7 +153,7 @@ def test_in(connection):
 )
 def test_in_calendar(connection, filter_value, pos_value, neg_value, mock_today):
     today = tinysg.utils.today()
-    query = connection._filter_to_query(["field", "in_calendar", *filter_value])
+    query = connection._filters_to_query([["field", "in_calendar", *filter_value]])
 
     offset, unit = filter_value
 
@@ -138,12 +163,19 @@ def test_in_calendar(connection, filter_value, pos_value, neg_value, mock_today)
     ), f"Date {pos_value} is not {offset} {unit}s from {today}"
 
 
+def test_in_calendar_days_across_months(connection, mock_today):
+    query = connection._filters_to_query([["field", "in_calendar", 1, "DAY"]])
+
+    assert query({"field": datetime.datetime(2000, 9, 3, 12, 0, 0)})
+    assert not query({"field": datetime.date(2000, 10, 3)})
+
+
 def test_in_calendar_invalid_unit(connection):
     with pytest.raises(
         ValueError,
         match="Invalidate unit: 'COWS' - expected .*",
     ):
-        query = connection._filter_to_query(["field", "in_calendar", 1, "COWS"])
+        query = connection._filters_to_query([["field", "in_calendar", 1, "COWS"]])
         query({"field": tinysg.utils.today()})
 
 
@@ -180,7 +212,7 @@ def test_in_calendar_invalid_unit(connection):
 )
 def test_in_last(connection, filter_value, value, expected, mock_today):
     today = tinysg.utils.today()
-    query = connection._filter_to_query(["field", "in_last", *filter_value])
+    query = connection._filters_to_query([["field", "in_last", *filter_value]])
 
     offset, unit = filter_value
 
@@ -190,13 +222,60 @@ def test_in_last(connection, filter_value, value, expected, mock_today):
     assert actual == expected, f"Date {value} {outcome} in the last {offset} {unit}s of {today}"
 
 
+def test_in_last_follows_today(connection, mock_today):
+    query = connection._filters_to_query([["field", "in_last", 1, "DAY"]])
+
+    assert query({"field": datetime.date(2000, 9, 1)})
+
+    mock_today.return_value = datetime.date(2000, 9, 5)
+
+    assert not query({"field": datetime.date(2000, 9, 1)})
+    assert query({"field": datetime.date(2000, 9, 4)})
+
+
+def test_in_last_not_cacheable(connection):
+    query = connection._filters_to_query([["field", "in_last", 1, "DAY"]])
+
+    assert not query.is_cacheable()
+
+
+def test_in_last_follows_today_in_find(test_data_copy, mock_today):
+    # The date filters compare date objects, so one is stored in memory directly.
+    test_data_copy["Asset"]["1"]["due"] = datetime.date(2000, 9, 1)
+
+    connection = Connection.from_dict(test_data_copy)
+    connection.schema_field_create("Asset", "due", {"type": "date"})
+
+    filters = [["due", "in_last", 1, "DAY"]]
+
+    assert [each["id"] for each in connection.find_all("Asset", filters)] == [1]
+
+    mock_today.return_value = datetime.date(2000, 9, 5)
+
+    assert connection.find_all("Asset", filters) == []
+
+
+def test_in_last_cached_today(connection, mock_today):
+    query = connection._filters_to_query([["field", "in_last", 1, "DAY"]])
+
+    with tinysg.utils.cache_today():
+        assert query({"field": datetime.date(2000, 9, 1)})
+
+        mock_today.return_value = datetime.date(2000, 9, 5)
+
+        assert query({"field": datetime.date(2000, 9, 1)})
+
+    assert mock_today.call_count == 1
+    assert not query({"field": datetime.date(2000, 9, 1)})
+
+
 def test_in_last_invalid_unit(connection):
     with pytest.raises(
         ValueError,
         match="Invalidate unit: 'COWS' - expected .*",
     ):
 
-        query = connection._filter_to_query(["field", "in_last", 1, "COWS"])
+        query = connection._filters_to_query([["field", "in_last", 1, "COWS"]])
         query({"field": tinysg.utils.today()})
 
 
@@ -205,7 +284,7 @@ def test_in_last_invalid_value(connection):
         ValueError,
         match="Number of days must be greater than zero.",
     ):
-        query = connection._filter_to_query(["field", "in_last", -1, "DAY"])
+        query = connection._filters_to_query([["field", "in_last", -1, "DAY"]])
         query({"field": tinysg.utils.today()})
 
 
@@ -242,7 +321,7 @@ def test_in_last_invalid_value(connection):
 )
 def test_in_next(connection, filter_value, value, expected, mock_today):
     today = tinysg.utils.today()
-    query = connection._filter_to_query(["field", "in_next", *filter_value])
+    query = connection._filters_to_query([["field", "in_next", *filter_value]])
 
     offset, unit = filter_value
 
@@ -257,7 +336,7 @@ def test_in_next_invalid_unit(connection):
         ValueError,
         match="Invalidate unit: 'COWS' - expected .*",
     ):
-        query = connection._filter_to_query(["field", "in_next", 1, "COWS"])
+        query = connection._filters_to_query([["field", "in_next", 1, "COWS"]])
         query({"field": tinysg.utils.today()})
 
 
@@ -266,20 +345,28 @@ def test_in_next_invalid_value(connection):
         ValueError,
         match="Number of days must be greater than zero.",
     ):
-        query = connection._filter_to_query(["field", "in_next", -1, "DAY"])
+        query = connection._filters_to_query([["field", "in_next", -1, "DAY"]])
         query({"field": tinysg.utils.today()})
 
 
 def test_is(connection):
-    query = connection._filter_to_query(["field", "is", "value"])
+    query = connection._filters_to_query([["field", "is", "value"]])
 
     assert query({"field": "value"})
     assert not query({"field", "foobar"})
     assert not query({})
 
 
+def test_is_cacheable(connection):
+    query = connection._filters_to_query([["field", "is", "value"]])
+
+    assert query.is_cacheable()
+    assert connection._filters_to_query([["field", "is", "value"]]) == query
+    assert connection._filters_to_query([["field", "is", "other"]]) != query
+
+
 def test_is_not(connection):
-    query = connection._filter_to_query(["field", "is_not", "value"])
+    query = connection._filters_to_query([["field", "is_not", "value"]])
 
     assert query({"field": "foobar"})
     assert not query({})
@@ -287,14 +374,14 @@ def test_is_not(connection):
 
 
 def test_not_between(connection):
-    query = connection._filter_to_query(["field", "not_between", 1, 10])
+    query = connection._filters_to_query([["field", "not_between", 1, 10]])
 
     assert query({"field": 15})
     assert not query({"field": 5})
 
 
 def test_not_contains(connection):
-    query = connection._filter_to_query(["field", "not_contains", "a"])
+    query = connection._filters_to_query([["field", "not_contains", "a"]])
 
     assert query({"field": "dog"})
     assert not query({"field": "cat"})
@@ -304,14 +391,14 @@ def test_not_contains(connection):
 
 
 def test_not_ends_with(connection):
-    query = connection._filter_to_query(["field", "not_ends_with", "z"])
+    query = connection._filters_to_query([["field", "not_ends_with", "z"]])
 
     assert query({"field": "fuss"})
     assert not query({"field": "fizz"})
 
 
 def test_not_in(connection):
-    query = connection._filter_to_query(["field", "not_in", ["value"]])
+    query = connection._filters_to_query([["field", "not_in", ["value"]]])
 
     assert query({"field": "foobar"})
     assert query({"field": ["foobar"]})
@@ -352,7 +439,7 @@ def test_not_in(connection):
 )
 def test_not_in_calendar(connection, filter_value, pos_value, neg_value, mock_today):
     today = tinysg.utils.today()
-    query = connection._filter_to_query(["field", "not_in_calendar", *filter_value])
+    query = connection._filters_to_query([["field", "not_in_calendar", *filter_value]])
 
     offset, unit = filter_value
 
@@ -371,26 +458,32 @@ def test_not_in_next(connection):
 
 
 def test_not_starts_with(connection):
-    query = connection._filter_to_query(["field", "not_starts_with", "a"])
+    query = connection._filters_to_query([["field", "not_starts_with", "a"]])
 
     assert query({"field": "beth"})
     assert not query({"field": "alice"})
 
 
 def test_starts_with(connection):
-    query = connection._filter_to_query(["field", "starts_with", "a"])
+    query = connection._filters_to_query([["field", "starts_with", "a"]])
 
     assert query({"field": "alice"})
     assert not query({"field": "beth"})
 
+    query = connection._filters_to_query([["field", "starts_with", ["a", "b"]]])
+
+    assert query({"field": "alice"})
+    assert query({"field": "beth"})
+    assert not query({"field": "carol"})
+
 
 def test_type_is(connection):
-    query = connection._filter_to_query(["field", "type_is", "Asset"])
+    query = connection._filters_to_query([["field", "type_is", "Asset"]])
 
     assert query({"field": {"type": "Asset"}})
     assert not query({"field": {"type": "Shot"}})
 
-    query = connection._filter_to_query(["field", "type_is", ["Asset", "Shot"]])
+    query = connection._filters_to_query([["field", "type_is", ["Asset", "Shot"]]])
 
     assert query({"field": {"type": "Asset"}})
     assert query({"field": {"type": "Shot"}})
@@ -398,12 +491,12 @@ def test_type_is(connection):
 
 
 def test_type_is_not(connection):
-    query = connection._filter_to_query(["field", "type_is_not", "Asset"])
+    query = connection._filters_to_query([["field", "type_is_not", "Asset"]])
 
     assert not query({"field": {"type": "Asset"}})
     assert query({"field": {"type": "Shot"}})
 
-    query = connection._filter_to_query(["field", "type_is_not", ["Asset", "Shot"]])
+    query = connection._filters_to_query([["field", "type_is_not", ["Asset", "Shot"]]])
 
     assert not query({"field": {"type": "Asset"}})
     assert not query({"field": {"type": "Shot"}})
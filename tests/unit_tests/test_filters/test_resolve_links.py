@@ -1,6 +1,5 @@
 """Test suite for query filter spec."""
 
-import json
 import pytest
 
 from tinysg import Connection
@@ -8,10 +7,8 @@ from tinysg.exceptions import FilterSpecError
 
 
 @pytest.fixture(scope="function")
-def connection(fs, test_data):
-    tmp = fs.create_file("db", contents=json.dumps(test_data))
-
-    return Connection(tmp.path)
+def connection(test_data_copy):
+    return Connection.from_dict(test_data_copy)
 
 
 def test_resolve_link_invalid_filter_spec(connection):
@@ -75,3 +72,29 @@ def test_resolve_multiple_links(connection):
     assert filters == [
         ["shots", "in", shots],
     ]
+
+
+def test_resolve_link_after_update(connection):
+    filters = [["sequence.Sequence.number", "is", "0300"]]
+
+    assert connection._resolve_filters("Shot", filters) == [
+        ["sequence", "is", {"type": "Sequence", "id": -1}],
+    ]
+
+    connection.update("Sequence", 2, {"number": "0300"})
+
+    assert connection._resolve_filters("Shot", filters) == [
+        ["sequence", "is", {"type": "Sequence", "id": 2}],
+    ]
+
+
+def test_find_deep_filter_after_update(connection):
+    filters = [["sequence.Sequence.number", "starts_with", "03"]]
+
+    assert connection.find_all("Shot", filters) == []
+
+    connection.update("Sequence", 2, {"number": "0300"})
+
+    assert connection.find_all("Shot", filters) == connection.find_all(
+        "Shot", [["sequence", "is", {"type": "Sequence", "id": 2}]]
+    )
@@ -1,17 +1,21 @@
 """Test for the pivot table middleware."""
 
-import json
 import pytest
 
 from tinydb import TinyDB, JSONStorage
 from tinysg.middleware import PivotTableMiddleware
 
 
+def _get_fields(data, entity_type):
+    return [field for field in data["_fields"].values() if field["entity_type"] == entity_type]
+
+
 @pytest.fixture
-def db(fs, test_data):
-    tmp = fs.create_file("db", contents=json.dumps(test_data))
+def db(tmp_path, test_data_json):
+    tmp = tmp_path / "db"
+    tmp.write_bytes(test_data_json)
 
-    return TinyDB(tmp.path, storage=PivotTableMiddleware(JSONStorage))
+    return TinyDB(str(tmp), storage=PivotTableMiddleware(JSONStorage))
 
 
 def test_middleware_read(db):
@@ -26,7 +30,7 @@ def test_middleware_read(db):
 
         link_fields = set()
 
-        for field in entity_info["fields"]:
+        for field in _get_fields(data, entity_type):
             if "table" not in field:
                 continue
 
@@ -39,8 +43,8 @@ def test_middleware_read(db):
 
         entity_fields = set()
 
-        for __, entity in table.items():
-            entity_fields.update(set(entity))
+        for entity in table.values():
+            entity_fields.update(entity)
 
         errant_fields = link_fields - entity_fields
         errant_fields_str = ",".join(sorted(errant_fields))
@@ -59,19 +63,28 @@ def test_middleware_write(db):
 
         table = data.get(entity_type, {})
 
-        fields = ["id", "type"]
-
-        for field in entity_info["fields"]:
-            if "table" in field:
-                fields.append(field["name"])
+        fields = {"id", "type"}
+        fields.update(
+            field["name"] for field in _get_fields(data, entity_type) if "table" in field
+        )
 
         errant_fields = set()
 
-        for __, entity in table.items():
-            for field in fields:
-                if field in entity:
-                    errant_fields.add(field)
+        for entity in table.values():
+            errant_fields.update(fields & entity.keys())
 
         errant_fields_str = ",".join(sorted(errant_fields))
 
         assert not errant_fields, f"{entity_type} still has {errant_fields_str}"
+        assert "fields" not in entity_info, f"{entity_type} schema has its fields"
+
+
+def test_middleware_write_pivot_tables(db, test_data):
+    data = db.storage.read()
+    data = db.storage.write(data)
+
+    for table in [each for each in test_data if each.startswith("Connection:")]:
+        expected = sorted(sorted(link.items()) for link in test_data[table].values())
+        actual = sorted(sorted(link.items()) for link in data[table].values())
+
+        assert actual == expected, f"{table} does not match"
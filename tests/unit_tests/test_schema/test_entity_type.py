@@ -1,6 +1,5 @@
 """Test suite for the schema editing methods."""
 
-import json
 import pytest
 
 from tinysg import Connection
@@ -8,10 +7,8 @@ from tinysg.exceptions import SchemaError
 
 
 @pytest.fixture(scope="function")
-def connection(fs, test_data):
-    tmp = fs.create_file("db", contents=json.dumps(test_data))
-
-    return Connection(tmp.path)
+def connection(test_data_copy):
+    return Connection.from_dict(test_data_copy)
 
 
 def test_schema_entity_create(connection):
@@ -44,6 +41,7 @@ def test_schema_entity_delete(connection):
     connection.schema_entity_delete("Asset")
 
     assert not connection.schema_entity_check("Asset")
+    assert connection.schema_entity_check("Project")
     assert not connection.schema_field_check("Shot", "assets")
 
     task_link_field = connection.schema_field_read("Task", "link")
@@ -0,0 +1,66 @@
+"""Test for the JSON storage."""
+
+import json
+import math
+import pytest
+
+from tinysg.storage import JSONStorage
+
+
+def test_storage_read_write(tmp_path, test_data_json):
+    tmp = tmp_path / "db"
+    tmp.write_bytes(test_data_json)
+
+    storage = JSONStorage(str(tmp))
+
+    data = storage.read()
+    data["_schema"]["1"]["entity_type"] = "Projet"
+
+    storage.write(data)
+
+    assert JSONStorage(str(tmp)).read() == data
+
+    with open(tmp, "r") as fp:
+        assert json.load(fp) == data
+
+
+def test_storage_read_empty(tmp_path):
+    tmp = tmp_path / "db"
+    tmp.touch()
+
+    assert JSONStorage(str(tmp)).read() is None
+
+
+@pytest.mark.parametrize(
+    "value",
+    [2**70, -(2**70), float("nan"), float("inf"), float("-inf")],
+    ids=["large integer", "large negative integer", "nan", "infinity", "negative infinity"],
+)
+def test_storage_read_write_non_orjson_value(tmp_path, test_data_json, value):
+    tmp = tmp_path / "db"
+    tmp.write_bytes(test_data_json)
+
+    storage = JSONStorage(str(tmp))
+
+    data = storage.read()
+    data["Asset"]["1"]["value"] = {"json": [value]}
+
+    storage.write(data)
+
+    (result,) = JSONStorage(str(tmp)).read()["Asset"]["1"]["value"]["json"]
+
+    assert type(result) is type(value)
+
+    if isinstance(value, float) and math.isnan(value):
+        assert math.isnan(result)
+    else:
+        assert result == value
+
+
+def test_storage_read_nan(tmp_path):
+    tmp = tmp_path / "db"
+    tmp.write_text(json.dumps({"Asset": {"1": {"value": float("nan")}}}))
+
+    data = JSONStorage(str(tmp)).read()
+
+    assert math.isnan(data["Asset"]["1"]["value"])
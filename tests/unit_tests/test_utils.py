@@ -0,0 +1,36 @@
+"""Test suite for the package utilities."""
+
+import pytest
+
+import tinysg.utils
+
+
+@pytest.mark.parametrize(
+    "table,expected",
+    [
+        ({}, {}),
+        ({"1": "a", "3": "b", "4": "c"}, {"1": "a", "2": "b", "3": "c"}),
+        ({"4": "c", "1": "a", "3": "b"}, {"1": "a", "2": "b", "3": "c"}),
+        ({"2": "a", "10": "b"}, {"1": "a", "2": "b"}),
+    ],
+    ids=[
+        "empty",
+        "in order",
+        "out of order",
+        "numeric order",
+    ],
+)
+def test_reindex(table, expected):
+    result = tinysg.utils.reindex(table)
+
+    assert list(result.items()) == list(expected.items())
+
+
+def test_freeze():
+    value = {"a": [1, {"b": 2}], "c": {3, 4}}
+
+    result = tinysg.utils.freeze(value)
+    hash(result)
+
+    assert result["a"] == (1, {"b": 2})
+    assert result["c"] == frozenset({3, 4})